@@ -1,22 +1,58 @@
 import allure
 import pytest
 import os
-from infra.clients.gmail_client import GmailClient
+from infra.clients.gmail_client import DEFAULT_CACHE_DIR, GmailClient
+from infra.clients.label_classifier import LabelClassifier
 from infra.clients.trello_client import TrelloClient
+from infra.clients.async_trello_client import AsyncTrelloClient
 from dotenv import load_dotenv
 from infra.pages.board_page import BoardPage
 from infra.utils.soft_assert import SoftAssert
+from infra.utils.logger_setup import shutdown_logging
 from infra.pages.login_page import LoginPage
+from infra.pages.context_pool import BrowserContextPool
+from infra.pages.response_index import TrelloResponseIndex
+from infra.utils.auth_state import AuthStateManager
+from infra.utils.lean_profile import LeanProfile, PageLoadMetrics
+from infra.utils.failure_capture import FailureCapture, capture_mode
 
 load_dotenv()
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    # Expose each phase's report on the test item (item.rep_setup / rep_call) for fixtures
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+def pytest_sessionfinish(session, exitstatus):
+    # Drain the background log writer so no record is lost at the end of the run
+    shutdown_logging()
+
 @pytest.fixture(scope="session")
 def gmail_client():
     data_path = os.path.join(os.path.dirname(__file__), 'data', 'mock_gmail_data.json')
-    return GmailClient(data_path)
+    streaming = os.getenv('GMAIL_STREAMING', 'false').lower() == 'true'
+    workers = int(os.getenv('GMAIL_WORKERS', '1'))
+    state_db = os.getenv('GMAIL_STATE_DB') or None
+    # Parsed once per data/rules version, then shared by every process (xdist workers included)
+    cache_dir = os.getenv('GMAIL_CACHE_DIR', os.path.join(os.path.dirname(__file__), DEFAULT_CACHE_DIR)) or None
+    label_filter = os.getenv('GMAIL_LABEL_FILTER') or None
+    label_rules = os.getenv('GMAIL_LABEL_RULES')
+    classifier = LabelClassifier.parse(label_rules) if label_rules else None
+    options = dict(workers=workers, state_db=state_db, cache_dir=cache_dir, label_filter=label_filter,
+                   classifier=classifier)
+    mbox_path = os.getenv('GMAIL_MBOX')
+    client = GmailClient.from_mbox(mbox_path, **options) if mbox_path else \
+        GmailClient(data_path, streaming=streaming, **options)
+    with client:
+        yield client
 
 @pytest.fixture(scope="session")
 def trello_client():
+    if os.getenv('TRELLO_ASYNC', 'false').lower() == 'true':
+        # Same get_all_cards() API, lists of the board are fetched concurrently
+        return AsyncTrelloClient()
     return TrelloClient()
 
 @pytest.fixture
@@ -25,18 +61,25 @@ def soft_assert():
     Fixture that provides soft assertion capability.
     Automatically raises an error at the end of the test if any checks failed.
     """
-    asserter = SoftAssert()
+    aggregate = os.getenv('SOFT_ASSERT_AGGREGATE', 'false').lower() == 'true'
+    asserter = SoftAssert(aggregate=aggregate)
     yield asserter
     asserter.assert_all()
 
 @pytest.fixture(scope="session")
 def browser_context_args(authenticated_context):
-    return {
+    args = {
         "storage_state": authenticated_context,
         "viewport": {"width": 1920, "height": 1080},
-        "record_video_dir": "allure-results/videos",
-        "record_video_size": {"width": 1920, "height": 1080}
     }
+    if capture_mode() == "video":
+        # Always-on recording; the default mode keeps traces of failed tests only (see failure_capture)
+        args["record_video_dir"] = "allure-results/videos"
+        args["record_video_size"] = {"width": 1920, "height": 1080}
+    if LeanProfile.from_env():
+        # Service workers would serve cached resources around the lean profile's routes
+        args["service_workers"] = "block"
+    return args
 
 
 # --- UI Fixtures ---
@@ -47,14 +90,14 @@ def authenticated_context(browser):
     Performs login ONCE per session and saves the storage state.
     SECURE IMPLEMENTATION: No hardcoded credentials.
     """
-    # 0. Login with existing state
-    state_path = "state.json"
+    # 0. Reuse the existing state if its session is still valid (checked without rendering a page).
+    #    A stale/missing state is refreshed under a file lock, so parallel workers log in only once.
+    auth_state = AuthStateManager.from_env("state.json")
+    return auth_state.ensure_valid(refresh=lambda state_path: _login_and_save_state(browser, state_path))
 
-    if os.path.exists(state_path):
-        print(f"✅ Loading existing authentication state from {state_path}")
-        return state_path
 
-    print("⚠️ No state.json found. Attempting automatic login (might fail due to 2FA)...")
+def _login_and_save_state(browser, state_path: str) -> str:
+    print("⚠️ No valid state.json found. Attempting automatic login (might fail due to 2FA)...")
 
     # 1. Load & Validate Credentials
     email = os.getenv("TRELLO_EMAIL")
@@ -65,14 +108,15 @@ def authenticated_context(browser):
             "CRITICAL: Missing credentials! Please set TRELLO_EMAIL and TRELLO_PASSWORD in your .env file."
         )
 
-    # 2. Setup Context
+    # 2. Setup Context (the login is only recorded in 'video' capture mode)
     video_dir = os.path.abspath("allure-results/login-video")
-    context = browser.new_context(
-        record_video_dir=video_dir,
-        record_video_size={"width": 1920, "height": 1080},
-        viewport={"width": 1920, "height": 1080}
-    )
+    video_args = {}
+    if capture_mode() == "video":
+        video_args = {"record_video_dir": video_dir, "record_video_size": {"width": 1920, "height": 1080}}
+    context = browser.new_context(viewport={"width": 1920, "height": 1080}, **video_args)
     page = context.new_page()
+    if not video_args:
+        context.tracing.start(screenshots=True, snapshots=True)
     
     # 3. Perform Login
     try:
@@ -81,9 +125,11 @@ def authenticated_context(browser):
         login_page.login(email, password)
     
     # 4. Save State
-        state_path = "state.json"
         context.storage_state(path=state_path)
     except Exception as e:
+        if not video_args:
+            _attach_login_trace(context)
+            raise e
         print(f"Login failed! Check video in {video_dir}")
         try:
             page.close()
@@ -106,8 +152,73 @@ def authenticated_context(browser):
         context.close()
     return state_path
 
+def _attach_login_trace(context):
+    trace_path = os.path.abspath("allure-results/login-trace.zip")
+    try:
+        context.tracing.stop(path=trace_path)
+        print(f"Login failed! Check trace in {trace_path}")
+        allure.attach.file(trace_path, name="Login Failure Trace", extension="zip")
+    except Exception as trace_error:
+        print(f"Failed to attach trace: {trace_error}")
+
+def _board_url() -> str:
+    # TRELLO_BOARD_URL points the UI tests at another board page, e.g. the offline data/static_board.html
+    if os.getenv('TRELLO_BOARD_URL'):
+        return os.getenv('TRELLO_BOARD_URL')
+    board_id = os.getenv('TRELLO_BOARD_ID', '2GzdgPlw')
+    return f"https://trello.com/b/{board_id}/droxi"
+
+@pytest.fixture(scope="session")
+def context_pool(authenticated_context, browser_name, browser_type_launch_args):
+    """
+    Pool of UI_POOL_SIZE authenticated contexts (default 4), opened from the saved storage state.
+    Used to inspect many card modals concurrently.
+    """
+    size = int(os.getenv('UI_POOL_SIZE', '4'))
+    pool = BrowserContextPool(
+        storage_state=authenticated_context,
+        board_url=_board_url(),
+        size=size,
+        browser_name=browser_name,
+        headless=browser_type_launch_args.get("headless", True)
+    )
+    with pool:
+        yield pool
+
 @pytest.fixture
-def board_page(page):
+def failure_capture(request, page, soft_assert):
+    """
+    Records a trace of the test and keeps a small screenshot ring buffer.
+    Artifacts reach the Allure results only if the test or its SoftAssert failed.
+    """
+    if capture_mode() == "video":
+        yield None
+        return
+
+    capture = FailureCapture(page)
+    capture.start()
+    soft_assert.add_failure_listener(capture.on_soft_assert_failure)
+    yield capture
+
+    # Runs before the soft_assert fixture's teardown, so soft failures are checked explicitly
+    report = getattr(request.node, "rep_call", None)
+    failed = soft_assert.has_failures or report is None or report.failed
+    capture.finish(failed, request.node.name)
+
+@pytest.fixture
+def lean_profile():
+    """Opt-in lean profile (LEAN_PROFILE=true): images/fonts/media and non allow-listed hosts are routed away."""
+    return LeanProfile.from_env()
+
+@pytest.fixture
+def context(context, lean_profile):
+    """pytest-playwright's context, with the lean profile routed before any of its pages is opened."""
+    if lean_profile:
+        lean_profile.install(context)
+    return context
+
+@pytest.fixture
+def board_page(page, failure_capture, lean_profile):
     """
     Instantiates the BoardPage object.
     
@@ -115,9 +226,14 @@ def board_page(page):
     The 'page' fixture is ALREADY logged in because 'browser_context_args' 
     injected the storage state automatically.
     """
-    board_id = os.getenv('TRELLO_BOARD_ID', '2GzdgPlw')
-    board_url = f"https://trello.com/b/{board_id}/droxi"
+    board_url = _board_url()
+    metrics = PageLoadMetrics(page)
+
+    # Capture the board/card JSON the web app downloads, so card details need no modal
+    response_index = TrelloResponseIndex()
+    response_index.attach(page)
     
+    metrics.start()
     page.goto(board_url)
 
     page.wait_for_load_state("domcontentloaded")
@@ -136,5 +252,8 @@ def board_page(page):
     except Exception:
         allure.attach(page.screenshot(), name="Board_Not_Found", attachment_type=allure.attachment_type.PNG)
         raise Exception(f"Failed to load board. Current URL: {page.url}")
+
+    metrics.mark_ready()
+    metrics.attach(lean_profile)
     
-    return BoardPage(page)
\ No newline at end of file
+    return BoardPage(page, response_index)
\ No newline at end of file
@@ -0,0 +1,95 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+from infra.clients.trello_client import CARD_FIELDS, TrelloClient
+from infra.clients.trello_transport import RateLimitGate, ThreadTransports, TrelloTransport
+from infra.modals.card_modal import CardModal
+from infra.utils.logger_setup import get_logger
+
+logger = get_logger("AsyncTrelloClient")
+
+
+class AsyncTrelloClient:
+    """
+    Asyncio front-end for fetching many boards at once.
+    Every board and every list of a board is fetched concurrently, with at most `max_concurrency`
+    requests in flight per host. Requests run on a dedicated pool of `max_concurrency` threads.
+    requests sessions are not thread-safe, so instead of one shared session every thread has its own
+    keep-alive TrelloTransport (one connection each). All of them share one RateLimitGate, so a
+    rate-limit window reported on any thread pauses the whole client, as with a single transport.
+    Produces the same CardModal objects as TrelloClient.get_all_cards.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, max_concurrency: int = 8):
+        # Load credentials from environment variables
+        self.api_key = os.getenv('TRELLO_API_KEY')
+        self.api_token = os.getenv('TRELLO_API_TOKEN')
+        self.board_id = os.getenv('TRELLO_BOARD_ID')
+        self.base_url = base_url or os.getenv('TRELLO_BASE_URL', "https://api.trello.com/1")
+        self.max_concurrency = max_concurrency
+
+        if not all([self.api_key, self.api_token]):
+            raise ValueError("Missing Trello credentials in .env file")
+
+        # Not asyncio's default executor, whose size has nothing to do with the concurrency limit
+        self._executor = ThreadPoolExecutor(max_concurrency, thread_name_prefix="trello-fetch")
+        self.rate_limit = RateLimitGate()
+        self._transports = ThreadTransports(lambda: TrelloTransport(
+            self.base_url, self.api_key, self.api_token, pool_size=1, gate=self.rate_limit))
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self._transports.close()
+
+    # --- Async API ---
+
+    async def fetch_boards(self, board_ids: Iterable[str]) -> Dict[str, List[CardModal]]:
+        """Fetches the cards of every board concurrently. Key = board id."""
+        board_ids = list(board_ids)
+        results = await asyncio.gather(*(self.fetch_board_cards(board_id) for board_id in board_ids))
+        return dict(zip(board_ids, results))
+
+    async def fetch_board_cards(self, board_id: str) -> List[CardModal]:
+        """Fetches the lists of a board, then the cards of all its lists concurrently."""
+        lists = await self._get_json(f"/boards/{board_id}/lists", {'fields': 'name'})
+        per_list = await asyncio.gather(*(
+            self._get_json(f"/lists/{trello_list['id']}/cards", {'fields': CARD_FIELDS})
+            for trello_list in lists
+        ))
+        logger.info(f"Fetched board {board_id}: {len(lists)} lists, {sum(len(cards) for cards in per_list)} cards")
+        return [TrelloClient.to_card_modal(card_json) for cards in per_list for card_json in cards]
+
+    async def _get_json(self, path: str, params: Dict[str, Any]) -> Any:
+        async with self._host_limit():
+            # requests is blocking; every executor thread sends over its own session
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._thread_get_json, path, params)
+
+    def _thread_get_json(self, path: str, params: Dict[str, Any]) -> Any:
+        return self._transports.get().get_json(path, params)
+
+    def _host_limit(self) -> asyncio.Semaphore:
+        host = urlparse(self.base_url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.max_concurrency)
+        return self._host_limits[host]
+
+    # --- Sync Wrappers ---
+
+    def get_cards_for_boards(self, board_ids: Iterable[str]) -> Dict[str, List[CardModal]]:
+        """Blocking wrapper around fetch_boards for sync callers (e.g. pytest fixtures)."""
+        return self._run(self.fetch_boards(board_ids))
+
+    def get_all_cards(self) -> List[CardModal]:
+        """Drop-in replacement for TrelloClient.get_all_cards on the configured board."""
+        if not self.board_id:
+            raise ValueError("Missing Trello credentials in .env file")
+        return self._run(self.fetch_board_cards(self.board_id))
+
+    def _run(self, coroutine):
+        # Semaphores belong to the event loop that created them; every asyncio.run starts a new one
+        self._host_limits.clear()
+        return asyncio.run(coroutine)
@@ -0,0 +1,169 @@
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List, Optional
+import requests
+from infra.clients.trello_transport import TrelloTransport
+from infra.utils.logger_setup import get_logger
+
+logger = get_logger("BoardSnapshotCache")
+
+# Actions after which the current version of the card has to be fetched again
+CARD_CHANGE_ACTIONS = {
+    "createCard", "copyCard", "updateCard", "moveCardToBoard", "convertToCardFromCheckItem",
+    "emailCard", "addLabelToCard", "removeLabelFromCard",
+}
+# Actions after which the card is no longer on the board
+CARD_REMOVAL_ACTIONS = {"deleteCard", "moveCardFromBoard"}
+# Actions that touch many cards at once (e.g. a renamed label, or a list moved or copied onto the
+# board with its cards, which get no card actions of their own); the snapshot is rebuilt
+BOARD_WIDE_ACTIONS = {
+    "updateLabel", "deleteLabel", "updateList", "moveListFromBoard", "moveListToBoard", "createList",
+}
+
+
+class BoardSnapshotCache:
+    """
+    On-disk snapshot of the raw card JSON of Trello boards.
+
+    A lookup first asks Trello for the board's `dateLastActivity` only:
+    - unchanged board  -> the snapshot is returned as is (one small request),
+    - few changes      -> only the cards named in the board actions since the snapshot are re-fetched,
+    - anything else    -> a full paginated download.
+    The total size of the snapshots is bounded; the least recently used boards are evicted first.
+    """
+
+    def __init__(self, transport: TrelloTransport, cache_dir: str, card_fields: str,
+                 max_bytes: int = 256 * 1024 * 1024, max_changed_cards: int = 200):
+        self.transport = transport
+        self.cache_dir = cache_dir
+        self.card_fields = card_fields
+        self.max_bytes = max_bytes
+        self.max_changed_cards = max_changed_cards
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get_cards(self, board_id: str) -> List[dict]:
+        """Returns the raw JSON of every open card of the board, refreshing the snapshot if needed."""
+        board = self.transport.get_json(f"/boards/{board_id}", {'fields': 'dateLastActivity'})
+        last_activity = board.get('dateLastActivity')
+        snapshot = self._load(board_id)
+
+        if snapshot and snapshot['dateLastActivity'] == last_activity:
+            logger.info(f"Board {board_id} unchanged since {last_activity}, using snapshot")
+            self._touch(board_id)
+            return list(snapshot['cards'].values())
+
+        cards = None
+        if snapshot:
+            cards = self._apply_changes(board_id, snapshot)
+        if cards is None:
+            logger.info(f"Downloading full snapshot of board {board_id}")
+            cards = self._download(board_id)
+
+        self._save(board_id, {'dateLastActivity': last_activity, 'cards': cards})
+        self._evict(keep=board_id)
+        return list(cards.values())
+
+    # --- Refresh Strategies ---
+
+    def _download(self, board_id: str) -> Dict[str, dict]:
+        cards = self.transport.iter_paginated(f"/boards/{board_id}/cards", {'fields': self.card_fields})
+        return {card['id']: card for card in cards}
+
+    def _apply_changes(self, board_id: str, snapshot: dict) -> Optional[Dict[str, dict]]:
+        """Patches the snapshot with the cards changed since it was taken. None = rebuild needed."""
+        actions = self.transport.get_json(f"/boards/{board_id}/actions", {
+            'since': snapshot['dateLastActivity'],
+            'filter': ",".join(sorted(CARD_CHANGE_ACTIONS | CARD_REMOVAL_ACTIONS | BOARD_WIDE_ACTIONS)),
+            'fields': 'type,data,date',
+            'limit': 1000,
+        })
+        if len(actions) >= 1000 or any(action['type'] in BOARD_WIDE_ACTIONS for action in actions):
+            return None
+
+        # Actions are returned newest first; replay them oldest first
+        changed, removed = set(), set()
+        for action in reversed(actions):
+            card_id = action.get('data', {}).get('card', {}).get('id')
+            if not card_id:
+                continue
+            if action['type'] in CARD_REMOVAL_ACTIONS:
+                removed.add(card_id)
+                changed.discard(card_id)
+            else:
+                changed.add(card_id)
+                removed.discard(card_id)
+
+        if len(changed) > self.max_changed_cards:
+            return None
+
+        cards = snapshot['cards']
+        for card_id in removed:
+            cards.pop(card_id, None)
+        for card_id in changed:
+            card = self._fetch_card(card_id)
+            if card is None or card.get('closed') or card.get('idBoard', board_id) != board_id:
+                cards.pop(card_id, None)
+            else:
+                cards[card_id] = {key: card[key] for key in ['id', *self.card_fields.split(',')] if key in card}
+
+        logger.info(f"Board {board_id}: patched snapshot with {len(changed)} changed / {len(removed)} removed cards")
+        return cards
+
+    def _fetch_card(self, card_id: str) -> Optional[dict]:
+        try:
+            return self.transport.get_json(f"/cards/{card_id}", {'fields': f"{self.card_fields},closed,idBoard"})
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
+
+    # --- Storage ---
+
+    def _path(self, board_id: str) -> str:
+        return os.path.join(self.cache_dir, f"{board_id}.json")
+
+    def _load(self, board_id: str) -> Optional[dict]:
+        try:
+            with open(self._path(board_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, board_id: str, snapshot: dict):
+        # Write-then-rename so a crashed run never leaves a truncated snapshot behind;
+        # a unique temp file per writer, so concurrent runs never write into the same one
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.cache_dir, prefix=f"{board_id}.",
+                                         suffix=".tmp", delete=False) as f:
+            tmp_path = f.name
+            try:
+                json.dump(snapshot, f)
+            except BaseException:
+                f.close()
+                os.remove(tmp_path)
+                raise
+        os.replace(tmp_path, self._path(board_id))
+
+    def _touch(self, board_id: str):
+        now = time.time()
+        os.utime(self._path(board_id), (now, now))
+
+    def _evict(self, keep: str):
+        """Removes least recently used snapshots until the cache fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                path = os.path.join(self.cache_dir, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == self._path(keep):
+                continue
+            logger.info(f"Evicting board snapshot {path}")
+            os.remove(path)
+            total -= size
@@ -0,0 +1,192 @@
+from array import array
+from typing import Dict, Iterable, List, Optional, Set
+from infra.modals.card_modal import CardModal
+
+# Descriptions up to this many bytes are searched directly; longer ones get a SubstringIndex
+INDEX_THRESHOLD = 16 * 1024
+
+
+class SubstringIndex:
+    """
+    Suffix automaton of a growing text: `text in index` walks `text` from the root in O(len(text)),
+    however long the indexed text is, and `extend` is amortized O(1) per added character.
+    Compact layout: most states have a single outgoing transition, kept in flat arrays; only
+    branching states get a dict.
+    """
+    __slots__ = ("_char", "_target", "_branches", "_link", "_length", "_last")
+
+    def __init__(self, text: str = ""):
+        self._char: List[Optional[str]] = [None]
+        self._target = array('q', [0])
+        self._branches: Dict[int, Dict[str, int]] = {}
+        self._link = array('q', [-1])
+        self._length = array('q', [0])
+        self._last = 0
+        self.extend(text)
+
+    def __contains__(self, text: str) -> bool:
+        chars, targets, branches, state = self._char, self._target, self._branches, 0
+        for char in text:
+            if state in branches:
+                state = branches[state].get(char)
+                if state is None:
+                    return False
+            elif chars[state] == char:
+                state = targets[state]
+            else:
+                return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self._length)
+
+    def extend(self, text: str):
+        # Transition lookups are inlined: this loop runs once per character of every description
+        chars, targets, branches, link, length = self._char, self._target, self._branches, self._link, self._length
+        for char in text:
+            current = len(length)
+            chars.append(None)
+            targets.append(0)
+            link.append(0)
+            length.append(length[self._last] + 1)
+
+            # Add `char` transitions to `current` along the suffix links, up to a state that has one
+            state = self._last
+            while state != -1:
+                state_branches = branches.get(state)
+                if state_branches is not None:
+                    if char in state_branches:
+                        break
+                    state_branches[char] = current
+                elif chars[state] is None:
+                    chars[state], targets[state] = char, current
+                elif chars[state] == char:
+                    break
+                else:
+                    branches[state] = {chars[state]: targets[state], char: current}
+                state = link[state]
+
+            if state != -1:
+                target = branches[state][char] if state in branches else targets[state]
+                if length[state] + 1 == length[target]:
+                    link[current] = target
+                else:
+                    # Split `target`: a clone takes the shorter suffixes that now also end here
+                    clone = len(length)
+                    chars.append(chars[target])
+                    targets.append(targets[target])
+                    link.append(link[target])
+                    length.append(length[state] + 1)
+                    if target in branches:
+                        branches[clone] = dict(branches[target])
+                    while state != -1:
+                        state_branches = branches.get(state)
+                        if state_branches is not None:
+                            if state_branches.get(char) != target:
+                                break
+                            state_branches[char] = clone
+                        elif chars[state] == char and targets[state] == target:
+                            targets[state] = clone
+                        else:
+                            break
+                        state = link[state]
+                    link[target] = link[current] = clone
+            self._last = current
+
+
+class _MergeState:
+    """
+    Per-card merge bookkeeping: the description as a growing UTF-8 buffer, the set of merged bodies
+    and, once the description is longer than INDEX_THRESHOLD, a SubstringIndex over it.
+    Short descriptions are searched in place (substring search on UTF-8 bytes gives the same answer
+    as on the text), so each check costs at most INDEX_THRESHOLD bytes, or O(len(body)) once indexed:
+    merging stays linear in total message bytes.
+    """
+    __slots__ = ("card", "buffer", "fingerprints", "index")
+
+    def __init__(self, card: CardModal):
+        self.card = card
+        self.buffer = bytearray()
+        self.fingerprints: Set[str] = set()
+        self.index: Optional[SubstringIndex] = None
+
+    def contains(self, body: str) -> bool:
+        """Equivalent to `body in description`."""
+        if body in self.fingerprints:
+            return True
+        if self.index is not None:
+            return body in self.index
+        encoded = body.encode('utf-8', 'surrogatepass')
+        return len(encoded) <= len(self.buffer) and encoded in self.buffer
+
+    def append(self, body: str):
+        self.extend(f"\n{body}" if self.buffer else body)
+        self.fingerprints.add(body)
+
+    def extend(self, text: str):
+        self.buffer += text.encode('utf-8', 'surrogatepass')
+        if self.index is not None:
+            self.index.extend(text)
+        elif len(self.buffer) > INDEX_THRESHOLD:
+            self.index = SubstringIndex(self.description())
+
+    def description(self) -> str:
+        return self.buffer.decode('utf-8', 'surrogatepass')
+
+
+class CardMerger:
+    """
+    Merge engine for duplicate-subject cards.
+    A new card starts with its first body as description. Later bodies are appended to a per-card
+    byte buffer and decoded into the description only once, when `finalize` is called. Containment checks use a per-card substring index once the
+    description is long, so thousands of distinct replies do not rescan it.
+    """
+
+    def __init__(self):
+        # Key = Normalized Title, Value = merge state of the card
+        self._states: Dict[str, _MergeState] = {}
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __contains__(self, title: str) -> bool:
+        return title in self._states
+
+    def add(self, title: str, body: str, labels: Iterable[str] = ()) -> Optional[CardModal]:
+        """
+        Merges one message into the card `title`. Returns the card if a new one was created; its
+        description is the first body, and replies merged later show up in it after `finalize`.
+        """
+        state = self._states.get(title)
+        new_card = None
+
+        if state is None:
+            # --- Logic 4: Create New Card ---
+            new_card = CardModal(title=title, description=body, labels=["New"])
+            state = self._states[title] = _MergeState(new_card)
+            if body:
+                state.append(body)
+
+        # --- Logic 3: Merge Strategy ---
+        # Append body only if it's not already there (simple de-duplication)
+        elif body and not state.contains(body):
+            state.append(body)
+
+        # Labels of THIS email (e.g. Urgent) apply to the whole card
+        for label in labels:
+            state.card.add_label(label)
+
+        return new_card
+
+    def restore(self, title: str, description: str, labels: Iterable[str]):
+        """Resumes merging into a card finalized earlier (e.g. loaded from a store)."""
+        state = self._states[title] = _MergeState(CardModal(title=title, description=description, labels=labels))
+        state.extend(description)
+
+    def finalize(self) -> List[CardModal]:
+        """Writes the collected bodies into each card's description, in creation order."""
+        cards = []
+        for state in self._states.values():
+            state.card.description = state.description()
+            cards.append(state.card)
+        return cards
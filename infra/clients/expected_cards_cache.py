@@ -0,0 +1,69 @@
+import hashlib
+import os
+import pickle
+from typing import Callable, List, Optional
+from infra.modals.card_modal import CardModal
+from infra.utils.logger_setup import get_logger
+
+logger = get_logger("ExpectedCardsCache")
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's content, read in chunks."""
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class ExpectedCardsCache:
+    """
+    On-disk cache of the expected cards computed from a mailbox file.
+    Entries are keyed by a key of the data (content digest, or an mbox fingerprint), a digest of the
+    rules and the selection variant (e.g. a label filter), so editing the data or the normalization
+    rules simply misses the cache. Entries are pickles of (title, description, label names) rows.
+    """
+
+    def __init__(self, cache_dir: str, rules_key: str):
+        self.cache_dir = cache_dir
+        self.rules_key = rules_key
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get_or_compute(self, data_key: str, compute: Callable[[], List[CardModal]],
+                       variant: str = "") -> List[CardModal]:
+        """:param data_key: Identity of the data, e.g. file_digest(path) or MboxSource.fingerprint()."""
+        entry_path = self._path(data_key, variant)
+
+        cards = self._load(entry_path)
+        if cards is not None:
+            logger.info(f"Loaded {len(cards)} expected cards from cache {os.path.basename(entry_path)}")
+            return cards
+
+        cards = compute()
+        self._store(entry_path, cards)
+        return cards
+
+    def _path(self, data_key: str, variant: str) -> str:
+        suffix = f"-{hashlib.sha256(variant.encode('utf-8')).hexdigest()[:16]}" if variant else ""
+        return os.path.join(self.cache_dir, f"{data_key}-rules-{self.rules_key[:16]}{suffix}.pickle")
+
+    @staticmethod
+    def _load(entry_path: str) -> Optional[List[CardModal]]:
+        try:
+            with open(entry_path, 'rb') as f:
+                rows = pickle.load(f)
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"Ignoring unreadable cache entry {entry_path}: {e}")
+            return None
+        return [CardModal(title, description, labels) for title, description, labels in rows]
+
+    @staticmethod
+    def _store(entry_path: str, cards: List[CardModal]):
+        rows = [(card.title, card.description, card.label_names) for card in cards]
+        # Per-process temp file: concurrent workers may fill the same entry
+        tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, entry_path)
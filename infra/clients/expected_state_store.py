@@ -0,0 +1,158 @@
+import sqlite3
+from email.utils import parsedate_to_datetime
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+from infra.clients.card_merger import CardMerger
+from infra.modals.card_modal import CardModal
+from infra.utils.logger_setup import get_logger
+
+logger = get_logger("ExpectedStateStore")
+
+# (message id, sort timestamp, normalized title, body, comma separated labels)
+MessageRow = Tuple[str, float, str, str, str]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id TEXT PRIMARY KEY,
+    sort_time REAL NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    labels TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_by_title ON messages (title, sort_time, id);
+CREATE TABLE IF NOT EXISTS cards (
+    title TEXT PRIMARY KEY,
+    description TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    first_time REAL NOT NULL,
+    first_id TEXT NOT NULL,
+    last_time REAL NOT NULL,
+    last_id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Bump when the tables change; a store with another layout is recreated
+SCHEMA_VERSION = 2
+
+# SQLite's default limit of host parameters per statement is 999
+ID_BATCH_SIZE = 500
+
+
+def message_sort_time(date_header: str) -> float:
+    """Epoch seconds of an RFC 2822 'date' field (0 when it is missing or malformed)."""
+    try:
+        return parsedate_to_datetime(date_header).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return 0.0
+
+
+class ExpectedStateStore:
+    """
+    SQLite store of processed messages and the merged card state they produce.
+    Messages of a title are merged in canonical (date, id) order, so the result does not depend on
+    the order messages arrived in. New messages that sort after the card's last merged message are
+    appended to the stored card; only a message arriving out of order makes the card rebuild from
+    all of its stored messages.
+    """
+
+    def __init__(self, db_path: str, rules_key: str = ""):
+        """
+        :param rules_key: Version of the rules that produced the stored titles and labels.
+                          A store written under other rules is cleared and rebuilt.
+        """
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.executescript(SCHEMA)
+        self._check_rules(rules_key)
+
+    def _check_rules(self, rules_key: str):
+        rules_key = f"schema{SCHEMA_VERSION}|{rules_key}"
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'rules'").fetchone()
+        if row is not None and row[0] == rules_key:
+            return
+        if row is not None:
+            logger.info(f"Rules changed ({row[0]!r} -> {rules_key!r}), rebuilding the store")
+            self.connection.executescript("DROP TABLE messages; DROP TABLE cards;" + SCHEMA)
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('rules', ?)", (rules_key,))
+
+    def close(self):
+        self.connection.close()
+
+    def unseen_ids(self, ids: List[str]) -> Set[str]:
+        """The ids from `ids` that are not stored yet."""
+        unseen = set(ids)
+        for start in range(0, len(ids), ID_BATCH_SIZE):
+            batch = ids[start:start + ID_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            for (known_id,) in self.connection.execute(
+                    f"SELECT id FROM messages WHERE id IN ({placeholders})", batch):
+                unseen.discard(known_id)
+        return unseen
+
+    def apply(self, rows: List[MessageRow]) -> int:
+        """Stores new messages and merges them into the cards of their titles. Returns the number of touched cards."""
+        by_title: Dict[str, List[MessageRow]] = defaultdict(list)
+        for row in rows:
+            by_title[row[2]].append(row)
+
+        rebuilt = 0
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO messages (id, sort_time, title, body, labels) VALUES (?, ?, ?, ?, ?)",
+                rows)
+            for title, title_rows in by_title.items():
+                title_rows.sort(key=lambda row: (row[1], row[0]))
+                if not self._append(title, title_rows):
+                    self._rebuild(title)
+                    rebuilt += 1
+        logger.info(f"Stored {len(rows)} new messages into {len(by_title)} cards ({rebuilt} rebuilt)")
+        return len(by_title)
+
+    def cards(self) -> List[CardModal]:
+        """Every stored card, in order of its first message."""
+        return [
+            CardModal(title, description, labels.split(",") if labels else [])
+            for title, description, labels in self.connection.execute(
+                "SELECT title, description, labels FROM cards ORDER BY first_time, first_id")
+        ]
+
+    def _append(self, title: str, rows: List[MessageRow]) -> bool:
+        """Merges rows that all sort after the card's last message into the stored card. False if impossible."""
+        card_row = self.connection.execute(
+            "SELECT description, labels, first_time, first_id, last_time, last_id FROM cards WHERE title = ?",
+            (title,)).fetchone()
+        if card_row is None:
+            return False
+        description, labels, first_time, first_id, last_time, last_id = card_row
+        if (rows[0][1], rows[0][0]) <= (last_time, last_id):
+            return False
+
+        merger = CardMerger()
+        merger.restore(title, description, labels.split(",") if labels else ())
+        for _, _, _, body, message_labels in rows:
+            merger.add(title, body, message_labels.split(",") if message_labels else ())
+        self._save(merger.finalize()[0], (first_time, first_id), (rows[-1][1], rows[-1][0]))
+        return True
+
+    def _rebuild(self, title: str):
+        merger = CardMerger()
+        first = last = None
+        for message_id, sort_time, body, labels in self.connection.execute(
+                "SELECT id, sort_time, body, labels FROM messages WHERE title = ? ORDER BY sort_time, id", (title,)):
+            if first is None:
+                first = (sort_time, message_id)
+            last = (sort_time, message_id)
+            merger.add(title, body, labels.split(",") if labels else ())
+
+        self._save(merger.finalize()[0], first, last)
+
+    def _save(self, card: CardModal, first: Tuple[float, str], last: Tuple[float, str]):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO cards (title, description, labels, first_time, first_id, last_time, last_id) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (card.title, card.description, ",".join(card.label_names), *first, *last))
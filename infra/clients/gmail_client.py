@@ -1,85 +1,321 @@
+import hashlib
+import inspect
 import json
 import os
 import re
-from typing import List, Dict
+from typing import Iterator, List, Optional
+from infra.clients import card_merger, label_classifier, label_filter, mbox_source
+from infra.clients.card_merger import CardMerger
+from infra.clients.expected_cards_cache import ExpectedCardsCache, file_digest
+from infra.clients.label_classifier import LabelClassifier
+from infra.clients.label_filter import LabelBits, LabelPredicate, LabelSelector, MessageLabelIndex
+from infra.clients.expected_state_store import ExpectedStateStore, MessageRow, message_sort_time
+from infra.clients.mbox_source import MboxSource
+from infra.clients.parallel_merge import ParsedChunk, merge_in_shards
 from infra.modals.card_modal import CardModal
+from infra.utils import json_stream
+from infra.utils.json_stream import JsonStreamReader
+
+# Shared title rule: "Task:" / "Meeting:" prefixes (case insensitive) are stripped from subjects
+TITLE_PREFIX_PATTERN = re.compile(r"(?i)^(Task:|Meeting:)\s*")
+
+# Bump when a rule change is not visible in rules_digest() (e.g. in a helper it does not cover)
+RULES_VERSION = 2
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "expected_cards")
 
 class GmailClient:
-    def __init__(self, data_file_path: str):
+    def __init__(self, data_file_path: str, streaming: bool = False, workers: int = 1,
+                 state_db: Optional[str] = None, cache_dir: Optional[str] = None,
+                 source: Optional[MboxSource] = None, label_filter: Optional[str] = None,
+                 classifier: Optional[LabelClassifier] = None):
+        """
+        :param data_file_path: Path to the mailbox JSON export.
+        :param streaming: Read messages incrementally instead of loading the whole file.
+        :param workers: Number of merge processes; cards are sharded between them by title hash.
+        :param state_db: SQLite file of an incremental run; only messages not stored there yet are merged.
+        :param cache_dir: Directory of cached results, keyed by the data (file digest or mbox fingerprint) and rules_digest().
+        :param source: Mailbox archive to read instead of the JSON export (see from_mbox).
+        :param label_filter: Gmail label predicate, e.g. "INBOX,-TRASH,-SPAM"; other messages are skipped.
+        :param classifier: Body keyword/regex rules for the card labels (default: "urgent" -> Urgent).
+        """
         self.data_file_path = data_file_path
+        self.streaming = streaming
+        self.workers = max(1, workers)
+        self.state_db = state_db
+        self.cache_dir = cache_dir
+        self.source = source
+        self.label_filter = LabelPredicate.parse(label_filter) if label_filter else None
+        self.classifier = classifier or LabelClassifier()
+
+    @classmethod
+    def from_mbox(cls, archive_path: str, **kwargs) -> "GmailClient":
+        """Client over an mbox archive (or a raw RFC822 message) instead of the JSON export."""
+        return cls(archive_path, source=MboxSource(archive_path), **kwargs)
+
+    def close(self):
+        """Releases the mailbox source (the mmap and file of an mbox archive)."""
+        if self.source:
+            self.source.close()
+
+    def __enter__(self) -> "GmailClient":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
     def _load_data(self) -> dict:
         """Loads the JSON data from the file."""
+        with self._open_data() as f:
+            return json.load(f)
+
+    def _open_data(self):
         if not os.path.exists(self.data_file_path):
             raise FileNotFoundError(f"Mock data file not found at: {self.data_file_path}")
-        
-        with open(self.data_file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+
+        return open(self.data_file_path, 'r', encoding='utf-8')
+
+    def get_labels(self) -> List[dict]:
+        """Returns the mailbox labels table (the top-level 'labels' header)."""
+        if self.source:
+            return self.source.get_labels()
+        if not self.streaming:
+            return self._load_data().get('labels', [])
+
+        with self._open_data() as f:
+            return JsonStreamReader(f).read_member('labels', [])
+
+    def iter_messages(self) -> Iterator[dict]:
+        """
+        Yields the raw messages of the mailbox that pass the label filter.
+        In streaming mode (and for mbox sources) only one message is held in memory at a time.
+        """
+        if not self.source and not self.streaming:
+            yield from self._select_loaded_messages(self._load_data())
+            return
+
+        if self.label_filter is None:
+            yield from self.source.iter_messages() if self.source else self._stream_messages()
+            return
+
+        # Labels are checked before anything else of the message is looked at
+        selector = LabelSelector(LabelBits(self.get_labels()), self.label_filter)
+        if self.source:
+            # Only the headers of a message are parsed until it is selected
+            for position in range(len(self.source)):
+                if selector.matches(self.source.labels_at(position)):
+                    yield self.source[position]
+            return
+
+        for msg in self._stream_messages():
+            if selector.matches(msg.get('labels', ())):
+                yield msg
+
+    def _stream_messages(self) -> Iterator[dict]:
+        with self._open_data() as f:
+            yield from JsonStreamReader(f).iter_member('messages')
+
+    def _select_loaded_messages(self, data: dict) -> Iterator[dict]:
+        messages = data.get('messages', [])
+        if self.label_filter is None:
+            yield from messages
+            return
+
+        index = MessageLabelIndex(LabelBits(data.get('labels', [])), (msg.get('labels', ()) for msg in messages))
+        for position in index.select(self.label_filter):
+            yield messages[position]
+
+    def iter_expected_cards(self) -> Iterator[CardModal]:
+        """
+        Yields every expected card as soon as the first message with its subject is processed.
+        A yielded card holds that message's body as description and its labels so far. A card whose
+        subject appears only once is final as yielded. Replies with the same subject later in the
+        mailbox add their labels right away, but their bodies are only joined into the description
+        once the generator is exhausted. Use get_expected_cards for final descriptions.
+        """
+        # Merge engine enforcing uniqueness by Subject Title
+        merger = CardMerger()
+        message_count = 0
+
+        for msg in self.iter_messages():
+            message_count += 1
+            new_card = self._apply_message(merger, msg)
+            if new_card is not None:
+                yield new_card
+
+        # Descriptions are joined once, after every message was merged
+        merger.finalize()
+        print(f"[DEBUG] Loaded {message_count} raw messages from JSON.")
 
     def get_expected_cards(self) -> List[CardModal]:
         """
         Parses the mock emails and returns a list of expected Trello Card objects
         applying the logic: Merging, Filtering, and Labeling.
         """
-        raw_data = self._load_data()
-        messages = raw_data.get('messages', [])
-        
-        print(f"[DEBUG] Loaded {len(messages)} raw messages from JSON.")
-        
-        # Dictionary to enforce uniqueness by Subject Title
-        # Key = Normalized Title, Value = CardModal
-        processed_cards: Dict[str, CardModal] = {}
-
-        for msg in messages:
-            raw_subject = msg.get('subject', '')
-            body = msg.get('body', '')
+        if self.state_db:
+            return self._get_expected_cards_incremental()
+        if self.cache_dir:
+            cache = ExpectedCardsCache(self.cache_dir, rules_digest())
+            # An mbox is keyed by its index header and mtime instead of re-hashing the whole archive
+            data_key = self.source.fingerprint() if self.source else file_digest(self.data_file_path)
+            variant = f"{self.label_filter or ''}|{self.classifier.signature}"
+            return cache.get_or_compute(data_key, self._compute_expected_cards, variant)
+        return self._compute_expected_cards()
 
-            # --- Logic 1: Aggressive Subject Normalization ---
-            # Remove "Task:" (case insensitive), remove "Meeting:", strip spaces
-            # Also remove double spaces inside the title
-            clean_title = re.sub(r"(?i)^(Task:|Meeting:)\s*", "", raw_subject).strip()
-            clean_title = " ".join(clean_title.split()) 
+    def _compute_expected_cards(self) -> List[CardModal]:
+        if self.workers > 1:
+            return self._get_expected_cards_parallel()
+        return list(self.iter_expected_cards())
 
+    def _get_expected_cards_incremental(self, batch_size: int = 5000) -> List[CardModal]:
+        """
+        Merges only the messages the state store has not seen, then returns every stored card.
+        Messages of a title are merged in (date, id) order, so cards are listed in order of their
+        oldest message rather than in mailbox order.
+        """
+        rules_key = f"{rules_digest()}|{self.label_filter or ''}|{self.classifier.signature}"
+        store = ExpectedStateStore(self.state_db, rules_key)
+        try:
+            batch = []
+            for msg in self.iter_messages():
+                batch.append(msg)
+                if len(batch) >= batch_size:
+                    self._store_new_messages(store, batch)
+                    batch = []
+            self._store_new_messages(store, batch)
+            return store.cards()
+        finally:
+            store.close()
+
+    def _store_new_messages(self, store: ExpectedStateStore, messages: List[dict]):
+        keyed = {self.message_id(msg): msg for msg in messages}
+        unseen = store.unseen_ids(list(keyed))
+        rows: List[MessageRow] = []
+        for message_id in unseen:
+            msg = keyed[message_id]
+            clean_title = self.normalize_title(msg.get('subject', ''))
             if not clean_title:
-                continue # Skip empty titles if any
-
-            # --- Logic 2: Urgency Check ---
-            is_urgent = "urgent" in body.lower()
-
-            if clean_title in processed_cards:
-                # --- Logic 3: Merge Strategy ---
-                existing_card = processed_cards[clean_title]
-                
-                # Append body only if it's not already there (simple de-duplication)
-                if body and body not in existing_card.description:
-                    if existing_card.description:
-                        existing_card.description += f"\n{body}"
-                    else:
-                        existing_card.description = body
-                
-                # If THIS email is urgent, the whole card becomes urgent
-                if is_urgent:
-                    existing_card.add_label("Urgent")
-            
-            else:
-                # --- Logic 4: Create New Card ---
-                new_card = CardModal(
-                    title=clean_title,
-                    description=body,
-                    labels=["New"]
-                )
-                if is_urgent:
-                    new_card.add_label("Urgent")
-                
-                processed_cards[clean_title] = new_card
-
-        return list(processed_cards.values())
+                continue
+            body = msg.get('body', '')
+            labels = ",".join(self.classifier.classify(body))
+            rows.append((message_id, message_sort_time(msg.get('date')), clean_title, body, labels))
+
+        # Title-less messages are not stored, so they are re-checked (and skipped again) on every run
+        if rows:
+            store.apply(rows)
+
+    @staticmethod
+    def message_id(msg: dict) -> str:
+        """The Gmail message id, or a content digest for exports without ids."""
+        if msg.get('id'):
+            return msg['id']
+        content = json.dumps([msg.get('subject'), msg.get('date'), msg.get('body')], ensure_ascii=False)
+        return "sha1:" + hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+    def _get_expected_cards_parallel(self, chunk_size: int = 2000) -> List[CardModal]:
+        """Same result as the serial path, with parsing, classification and merging spread over processes."""
+        if self.source:
+            # Workers read the messages themselves; only position ranges leave this process
+            chunks = (range(start, min(start + chunk_size, len(self.source)))
+                      for start in range(0, len(self.source), chunk_size))
+            cards, message_count = merge_in_shards(
+                chunks, _parse_chunk, self.workers, self.classifier, initializer=_init_parse_worker,
+                initargs=(self.source.path, self.source.index_path, self.label_filter))
+        else:
+            # JSON messages are already decoded here; titles are normalized in this process and the
+            # (title, body) pairs go straight to the merge shards, without a round trip through a pool
+            cards, message_count = merge_in_shards(self._message_chunks(chunk_size), _parse_chunk,
+                                                   self.workers, self.classifier, parse_in_pool=False)
+        print(f"[DEBUG] Loaded {message_count} raw messages from JSON.")
+        return cards
+
+    def _message_chunks(self, chunk_size: int) -> Iterator[List[dict]]:
+        chunk = []
+        for msg in self.iter_messages():
+            chunk.append(msg)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def normalize_title(raw_subject: str) -> str:
+        """Removes the 'Task:'/'Meeting:' prefix (case insensitive) and collapses whitespace."""
+        clean_title = TITLE_PREFIX_PATTERN.sub("", raw_subject).strip()
+        return " ".join(clean_title.split())
+
+    def _apply_message(self, merger: CardMerger, msg: dict) -> Optional[CardModal]:
+        """Merges one message into `merger`. Returns the card if a new one was created."""
+        raw_subject = msg.get('subject', '')
+        body = msg.get('body', '')
+
+        # --- Logic 1: Aggressive Subject Normalization ---
+        # Remove "Task:" (case insensitive), remove "Meeting:", strip spaces
+        # Also remove double spaces inside the title
+        clean_title = self.normalize_title(raw_subject)
+
+        if not clean_title:
+            return None # Skip empty titles if any
+
+        # --- Logic 2: Label Rules (e.g. Urgency), one pass over the body ---
+        labels = self.classifier.classify(body)
+
+        # --- Logic 3 & 4: Merge into an existing card or create a new one ---
+        return merger.add(clean_title, body, labels)
+
+def rules_digest() -> str:
+    """
+    Digest of what shapes the expected cards: RULES_VERSION, the title pattern and the source of the
+    whole pipeline - message reading and selection, decoding, normalization, labeling and merging.
+    Editing any of them invalidates cached results.
+    """
+    hasher = hashlib.sha256(f"{RULES_VERSION}|{TITLE_PREFIX_PATTERN.pattern}".encode('utf-8'))
+    pipeline = (GmailClient.iter_messages, GmailClient._stream_messages, GmailClient._select_loaded_messages,
+                GmailClient.normalize_title, GmailClient._apply_message,
+                card_merger, label_classifier, label_filter, mbox_source, json_stream)
+    for code in pipeline:
+        hasher.update(inspect.getsource(code).encode('utf-8'))
+    return hasher.hexdigest()
+
+
+# --- Parallel Parse Stage (runs in worker processes for mbox archives) ---
+
+_worker_source: Optional[MboxSource] = None
+_worker_selector: Optional[LabelSelector] = None
+
+
+def _init_parse_worker(archive_path: Optional[str], index_path: Optional[str],
+                       label_filter: Optional[LabelPredicate]):
+    """Opens the worker's own view of an mbox archive; its offset index is read from the index file."""
+    global _worker_source, _worker_selector
+    if archive_path:
+        _worker_source = MboxSource(archive_path, index_path)
+        if label_filter:
+            _worker_selector = LabelSelector(LabelBits(_worker_source.get_labels()), label_filter)
+
+
+def _parse_chunk(chunk) -> ParsedChunk:
+    """(title, body) pairs of a range of mbox positions (in a pool worker), or of decoded JSON messages."""
+    if isinstance(chunk, range):
+        messages = [_worker_source[position] for position in chunk
+                    if _worker_selector is None or _worker_selector.matches(_worker_source.labels_at(position))]
+    else:
+        messages = chunk
+
+    items = []
+    for msg in messages:
+        clean_title = GmailClient.normalize_title(msg.get('subject', ''))
+        if clean_title:
+            items.append((clean_title, msg.get('body', '')))
+    return len(messages), items
+
 
 # --- Execution for testing ---
 if __name__ == "__main__":
     # Ensure the path is correct
     path = os.path.join(os.getcwd(), 'data', 'mock_gmail_data.json')
-    client = GmailClient(path)
+    client = GmailClient(path, cache_dir=os.getenv('GMAIL_CACHE_DIR', DEFAULT_CACHE_DIR) or None)
     
     try:
         cards = client.get_expected_cards()
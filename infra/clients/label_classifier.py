@@ -0,0 +1,110 @@
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+
+# Escapes (\\S, \\W, ...) and group syntax ((?P<name>...), (?P=name)) may be upper case in a regex rule
+_REGEX_SYNTAX = re.compile(r"\\.|\(\?P[<=][^>)]*[>)]?")
+
+
+@dataclass(frozen=True)
+class LabelRule:
+    """
+    Adds `label` to a card when a message body contains `pattern` (case insensitive).
+    Regex rules are matched against the lower-cased body, so their literals must be lower case.
+    """
+    label: str
+    pattern: str
+    is_regex: bool = False
+
+    def __post_init__(self):
+        if self.is_regex and _REGEX_SYNTAX.sub("", self.pattern) != _REGEX_SYNTAX.sub("", self.pattern).lower():
+            raise ValueError(f"Regex rule /{self.pattern}/ for '{self.label}' is matched against lower-cased "
+                             f"text and must be written in lower case")
+
+    @property
+    def expression(self) -> str:
+        """The rule as a regex over lower-cased text."""
+        return self.pattern if self.is_regex else re.escape(self.pattern.lower())
+
+    def __str__(self):
+        return f"{self.label}=/{self.pattern}/" if self.is_regex else f"{self.label}={self.pattern}"
+
+
+DEFAULT_RULES = (LabelRule("Urgent", "urgent"),)
+
+
+class LabelClassifier:
+    """
+    Maps keyword/regex rules to Trello labels in a single pass over a message body.
+    All rules are compiled into one alternation over the lower-cased body, with a named group per
+    rule telling which rule matched. Where the alternation matches, the rules of labels not found
+    yet are also tried at that same position (another rule's match can hide them), and the scan
+    resumes one character later, so overlapping matches are not lost. The scan stops as soon as
+    every label has been found. Picklable, so merge worker processes can use - and report the
+    label hits of - their own copy.
+
+    `label_hits` counts, per rule, the messages it gave their label: each labeled message is
+    counted once per label, under the rule that found the label first. Other rules for the same
+    label that would also match are not tried (that is what lets the scan stop early), so this is
+    not a count of every rule match.
+    """
+
+    def __init__(self, rules: Sequence[LabelRule] = DEFAULT_RULES):
+        self.rules = tuple(rules)
+        self.label_hits: Counter = Counter()
+        self._labels_in_order = list(dict.fromkeys(rule.label for rule in self.rules))
+        self._label_count = len(self._labels_in_order)
+
+        self._group_rules: Dict[str, LabelRule] = {f"_rule{index}": rule for index, rule in enumerate(self.rules)}
+        self._rule_patterns = [(rule, re.compile(rule.expression)) for rule in self.rules]
+        self._pattern = re.compile(
+            "|".join(f"(?P<{group}>{rule.expression})" for group, rule in self._group_rules.items())
+        ) if self.rules else None
+
+    @classmethod
+    def parse(cls, spec: str) -> "LabelClassifier":
+        """Builds a classifier from "Label=keyword,keyword;Label=/regex/" (e.g. from an env var)."""
+        rules = []
+        for entry in spec.split(";"):
+            if not entry.strip():
+                continue
+            label, _, patterns = entry.partition("=")
+            for pattern in patterns.split(","):
+                pattern = pattern.strip()
+                if len(pattern) > 1 and pattern.startswith("/") and pattern.endswith("/"):
+                    rules.append(LabelRule(label.strip(), pattern[1:-1], is_regex=True))
+                elif pattern:
+                    rules.append(LabelRule(label.strip(), pattern))
+        return cls(rules)
+
+    @property
+    def signature(self) -> str:
+        """Stable description of the rules, for cache keys."""
+        return ";".join(str(rule) for rule in self.rules)
+
+    def classify(self, body: str) -> List[str]:
+        """Every label whose rule matches `body`, in rule order."""
+        if self._pattern is None or not body:
+            return []
+
+        text = body.lower()
+        labels = set()
+        match = self._pattern.search(text)
+        while match is not None:
+            self._add(labels, self._group_rules[match.lastgroup])
+            position = match.start()
+            for rule, pattern in self._rule_patterns:
+                if rule.label not in labels and pattern.match(text, position):
+                    self._add(labels, rule)
+            if len(labels) == self._label_count:
+                break
+            match = self._pattern.search(text, position + 1)
+
+        return [label for label in self._labels_in_order if label in labels]
+
+    def _add(self, labels: set, rule: LabelRule):
+        if rule.label not in labels:
+            labels.add(rule.label)
+            self.label_hits[str(rule)] += 1
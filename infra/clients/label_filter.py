@@ -0,0 +1,95 @@
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+
+class LabelBits:
+    """
+    One bit per Gmail label, in the order of the mailbox labels table.
+    A label's id and name resolve to the same bit (case insensitive, so mbox names like
+    "Inbox" match the API id "INBOX"); labels missing from the table get a bit on first use.
+    """
+
+    def __init__(self, labels_table: Iterable[dict] = ()):
+        self._bits: Dict[str, int] = {}
+        self._count = 0
+        for label in labels_table:
+            bit = self.bit(label['id'])
+            if label.get('name'):
+                self._bits.setdefault(label['name'].upper(), bit)
+
+    def bit(self, label: str) -> int:
+        key = label.upper()
+        bit = self._bits.get(key)
+        if bit is None:
+            bit = self._bits[key] = 1 << self._count
+            self._count += 1
+        return bit
+
+    def mask(self, labels: Iterable[str]) -> int:
+        mask = 0
+        for label in labels:
+            mask |= self.bit(label)
+        return mask
+
+
+class LabelPredicate:
+    """
+    Label condition of a message: every `required` label and none of the `excluded` ones.
+    Written as a comma separated expression, excluded labels prefixed with '-':
+    "INBOX,-TRASH,-SPAM" selects inbox messages that are neither trashed nor spam.
+    """
+
+    def __init__(self, required: Sequence[str] = (), excluded: Sequence[str] = ()):
+        self.required = tuple(required)
+        self.excluded = tuple(excluded)
+
+    @classmethod
+    def parse(cls, expression: str) -> "LabelPredicate":
+        required, excluded = [], []
+        for term in expression.split(","):
+            term = term.strip()
+            label = term[1:].strip() if term.startswith("-") else term
+            if not label:
+                raise ValueError(f"Empty label in label filter {expression!r}")
+            (excluded if term.startswith("-") else required).append(label)
+        return cls(required, excluded)
+
+    def __str__(self):
+        return ",".join([*self.required, *(f"-{label}" for label in self.excluded)])
+
+    def compile(self, bits: LabelBits) -> Tuple[int, int]:
+        """(required mask, excluded mask) of the predicate against a label table."""
+        return bits.mask(self.required), bits.mask(self.excluded)
+
+
+class MessageLabelIndex:
+    """
+    Label bitmap of every message (one int mask per message position), so label
+    predicates are evaluated with two integer operations per message, without looking
+    at the subject or body.
+    """
+
+    def __init__(self, bits: LabelBits, message_labels: Iterable[Iterable[str]]):
+        self.bits = bits
+        self.masks: List[int] = [bits.mask(labels) for labels in message_labels]
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    def select(self, predicate: LabelPredicate) -> Iterator[int]:
+        """Positions of the messages matching `predicate`, in mailbox order."""
+        required, excluded = predicate.compile(self.bits)
+        for position, mask in enumerate(self.masks):
+            if mask & required == required and not mask & excluded:
+                yield position
+
+
+class LabelSelector:
+    """Streaming form of MessageLabelIndex.select, for sources read one message at a time."""
+
+    def __init__(self, bits: LabelBits, predicate: LabelPredicate):
+        self.bits = bits
+        self.required, self.excluded = predicate.compile(bits)
+
+    def matches(self, labels: Iterable[str]) -> bool:
+        mask = self.bits.mask(labels)
+        return mask & self.required == self.required and not mask & self.excluded
@@ -0,0 +1,252 @@
+import base64
+import binascii
+import mmap
+import os
+import quopri
+import re
+import struct
+import zlib
+from array import array
+from email.header import decode_header, make_header
+from email.message import Message
+from email.parser import BytesHeaderParser
+from typing import Iterator, List, Optional, Tuple
+from infra.utils.logger_setup import get_logger
+
+logger = get_logger("MboxSource")
+
+INDEX_MAGIC = b"MBOXIDX1"
+# magic, bytes of the archive covered by the index, crc32 of the archive head
+INDEX_HEADER = struct.Struct("<8sQI")
+HEAD_CHECK_BYTES = 64 * 1024
+
+# Nested multiparts deeper than this are not searched for a text/plain body
+MAX_MULTIPART_DEPTH = 5
+
+# mboxrd quoting: one '>' is added to every line matching ">*From "
+MBOXRD_QUOTED = re.compile(rb"^>(>*From )", re.MULTILINE)
+
+
+class MboxSource:
+    """
+    Mailbox source over an mbox archive (or a single raw RFC822 message), read through mmap.
+
+    The start offset of every message is kept in a persistent index file next to the archive.
+    When the archive grows, only the appended bytes are scanned; random access is an index lookup.
+    Only the headers and the first text/plain part of a message are decoded - attachments and
+    other parts are skipped without being copied out of the mapping.
+    """
+
+    def __init__(self, path: str, index_path: Optional[str] = None):
+        self.path = path
+        self.index_path = index_path or f"{path}.idx"
+        # compat32 headers stay raw strings; only the few fields we return are decoded
+        self._header_parser = BytesHeaderParser()
+
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        # mbox messages start with a "From " separator line; a raw RFC822 export is one message
+        self._has_separators = self._mm[:5] == b"From "
+        self._offsets = self._build_index()
+
+    def close(self):
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._file.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, position: int) -> dict:
+        start, end = self._bounds(position)
+        return self._parse_message(start, end)
+
+    def labels_at(self, position: int) -> List[str]:
+        """The Gmail labels of a message, read from its headers only (the body is not decoded)."""
+        start, end = self._bounds(position)
+        headers, _ = self._split_headers(start, end)
+        return self._labels(headers)
+
+    def iter_messages(self, start: int = 0) -> Iterator[dict]:
+        """Yields the messages from position `start` on (e.g. to resume an interrupted run)."""
+        for position in range(start, len(self._offsets)):
+            yield self[position]
+
+    def get_labels(self) -> List[dict]:
+        # mbox archives have no labels table; labels are only found on the messages
+        return []
+
+    def fingerprint(self) -> str:
+        """
+        Identity of the mapped archive without reading all of it: the fields of the index header
+        (size covered and head checksum) plus the file's mtime.
+        """
+        size = len(self._mm)
+        mtime_ns = os.fstat(self._file.fileno()).st_mtime_ns
+        return f"mbox-{size}-{mtime_ns}-{self._head_crc(size):08x}"
+
+    # --- Offset Index ---
+
+    def _build_index(self) -> array:
+        size = len(self._mm)
+        if not size:
+            return array('Q')
+        if not self._has_separators:
+            return array('Q', [0])
+
+        offsets, scanned = self._load_index(size)
+        if scanned == size:
+            return offsets
+
+        # Resume after the indexed part; a separator is only valid at the start of a line
+        position = 0 if not offsets else max(scanned - 1, 0)
+        if not offsets:
+            offsets.append(0)
+        new_messages = 0
+        while True:
+            position = self._mm.find(b"\nFrom ", position, size)
+            if position < 0:
+                break
+            offsets.append(position + 1)
+            new_messages += 1
+            position += 1
+
+        logger.info(f"Indexed {new_messages} new messages of {self.path} ({len(offsets)} in total)")
+        self._save_index(offsets, size)
+        return offsets
+
+    def _load_index(self, size: int) -> Tuple[array, int]:
+        offsets = array('Q')
+        try:
+            with open(self.index_path, 'rb') as f:
+                magic, scanned, head_crc = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+                if magic != INDEX_MAGIC or scanned > size or head_crc != self._head_crc(scanned):
+                    return array('Q'), 0
+                offsets.frombytes(f.read())
+        except (OSError, struct.error, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"Rebuilding unreadable index {self.index_path}: {e}")
+            return array('Q'), 0
+        return offsets, scanned
+
+    def _save_index(self, offsets: array, size: int):
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(INDEX_HEADER.pack(INDEX_MAGIC, size, self._head_crc(size)))
+                offsets.tofile(f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            # A read-only archive directory only costs a rescan next time
+            logger.warning(f"Could not save index {self.index_path}: {e}")
+
+    def _head_crc(self, scanned: int) -> int:
+        """Checksum of the archive head, to notice an archive that was replaced rather than appended to."""
+        return zlib.crc32(self._mm[:min(scanned, HEAD_CHECK_BYTES)])
+
+    def _bounds(self, position: int) -> Tuple[int, int]:
+        start = self._offsets[position]
+        end = self._offsets[position + 1] if position + 1 < len(self._offsets) else len(self._mm)
+        if self._has_separators:
+            start = self._mm.find(b"\n", start, end) + 1 or end
+        return start, end
+
+    # --- Message Decoding ---
+
+    def _parse_message(self, start: int, end: int) -> dict:
+        headers, body_start = self._split_headers(start, end)
+        body = self._find_text_plain(headers, body_start, end, depth=0)
+        return {
+            "id": (headers.get('Message-ID') or f"offset:{start}").strip(),
+            "subject": self._header_text(headers, 'Subject'),
+            "date": self._header_text(headers, 'Date'),
+            "from": self._header_text(headers, 'From'),
+            "body": body or "",
+            "labels": self._labels(headers),
+        }
+
+    def _labels(self, headers: Message) -> List[str]:
+        labels = self._header_text(headers, 'X-Gmail-Labels')
+        return [label.strip() for label in labels.split(",") if label.strip()]
+
+    @staticmethod
+    def _header_text(headers: Message, name: str) -> str:
+        """Header value with RFC 2047 encoded words decoded and folding removed."""
+        value = headers.get(name)
+        if value is None:
+            return ""
+        try:
+            text = str(make_header(decode_header(value)))
+        except (LookupError, ValueError):
+            text = str(value)
+        return " ".join(text.split())
+
+    def _split_headers(self, start: int, end: int) -> Tuple[Message, int]:
+        """Parses the header block of the entity at [start, end). Returns the headers and the body offset."""
+        for blank_line in (b"\n", b"\r\n"):
+            if self._mm[start:start + len(blank_line)] == blank_line:
+                # Entity without headers (e.g. a MIME part that defaults to text/plain)
+                return self._header_parser.parsebytes(b""), start + len(blank_line)
+
+        separators = [(self._mm.find(sep, start, end), len(sep)) for sep in (b"\n\n", b"\r\n\r\n")]
+        found = [(position, length) for position, length in separators if position >= 0]
+        if found:
+            position, length = min(found)
+            header_end, body_start = position + 1, position + length
+        else:
+            header_end = body_start = end
+        return self._header_parser.parsebytes(self._mm[start:header_end]), body_start
+
+    def _find_text_plain(self, headers: Message, start: int, end: int, depth: int) -> Optional[str]:
+        content_type = headers.get_content_type()
+        if content_type.startswith("multipart/"):
+            boundary = headers.get_param("boundary")
+            if not boundary or depth >= MAX_MULTIPART_DEPTH:
+                return None
+            for part_start, part_end in self._iter_parts(start, end, str(boundary).encode('ascii', 'replace')):
+                part_headers, part_body = self._split_headers(part_start, part_end)
+                text = self._find_text_plain(part_headers, part_body, part_end, depth + 1)
+                if text is not None:
+                    return text
+            return None
+
+        if content_type == "text/plain" and headers.get_content_disposition() != "attachment":
+            return self._decode_text(headers, self._mm[start:end])
+        return None
+
+    def _iter_parts(self, start: int, end: int, boundary: bytes) -> Iterator[Tuple[int, int]]:
+        delimiter = b"--" + boundary
+        position = self._mm.find(delimiter, start, end)
+        while position >= 0:
+            after = position + len(delimiter)
+            if self._mm[after:after + 2] == b"--":
+                return
+            part_start = self._mm.find(b"\n", after, end) + 1
+            if not part_start:
+                return
+            next_delimiter = self._mm.find(b"\n" + delimiter, part_start, end)
+            part_end = next_delimiter if next_delimiter >= 0 else end
+            yield part_start, part_end
+            position = next_delimiter + 1 if next_delimiter >= 0 else -1
+
+    def _decode_text(self, headers: Message, payload: bytes) -> str:
+        if self._has_separators:
+            # The quoting was applied to the stored lines, so it is undone before any transfer decoding
+            payload = MBOXRD_QUOTED.sub(rb"\1", payload)
+
+        encoding = str(headers.get('Content-Transfer-Encoding', '')).strip().lower()
+        try:
+            if encoding == "base64":
+                payload = base64.b64decode(payload)
+            elif encoding == "quoted-printable":
+                payload = quopri.decodestring(payload)
+        except (binascii.Error, ValueError):
+            pass
+
+        charset = headers.get_content_charset() or "utf-8"
+        try:
+            text = payload.decode(charset, errors='replace')
+        except LookupError:
+            text = payload.decode('utf-8', errors='replace')
+        return text.replace("\r\n", "\n").strip()
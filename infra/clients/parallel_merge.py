@@ -0,0 +1,126 @@
+import multiprocessing
+import queue
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+from infra.clients.card_merger import CardMerger
+from infra.clients.label_classifier import LabelClassifier
+from infra.modals.card_modal import CardModal
+
+# (normalized title, body) pairs, in mailbox order
+MergeItem = Tuple[str, str]
+# What the parse stage makes of one chunk: the number of messages read and their merge items
+ParsedChunk = Tuple[int, List[MergeItem]]
+
+
+def shard_of(title: str, shard_count: int) -> int:
+    """Stable shard number of a normalized title (unlike hash(), identical in every process)."""
+    return zlib.crc32(title.encode('utf-8')) % shard_count
+
+
+def _merge_shard(inbox, outbox, classifier: LabelClassifier):
+    """Worker loop: merges every batch routed to this shard, then reports the cards (and label hits) once."""
+    merger = CardMerger()
+    first_seen = {}
+
+    for batch in iter(inbox.get, None):
+        for seq, title, body in batch:
+            if merger.add(title, body, classifier.classify(body)) is not None:
+                first_seen[title] = seq
+
+    outbox.put(([(first_seen[card.title], card) for card in merger.finalize()], classifier.label_hits))
+
+
+def _put(inbox, item, processes):
+    """Queue.put that gives up instead of blocking forever on a crashed worker."""
+    while True:
+        try:
+            inbox.put(item, timeout=1)
+            return
+        except queue.Full:
+            _raise_if_crashed(processes)
+
+
+def _raise_if_crashed(processes):
+    crashed = [p.exitcode for p in processes if p.exitcode not in (None, 0)]
+    if crashed:
+        raise RuntimeError(f"Merge worker exited with code {crashed[0]}")
+
+
+def merge_in_shards(chunks: Iterable[Any], parse: Callable[[Any], ParsedChunk], workers: int,
+                    classifier: LabelClassifier, initializer: Optional[Callable] = None,
+                    initargs: tuple = (), batch_size: int = 1000,
+                    parse_in_pool: bool = True) -> Tuple[List[CardModal], int]:
+    """
+    Computes the cards in two process stages:
+    1. a pool of `workers` processes runs `parse` over the chunks (reading and title normalization),
+    2. `workers` shard processes run the CardMerger logic, messages routed by title hash.
+    With `parse_in_pool=False` the first stage runs in this process instead. Use that for chunks that
+    are already decoded messages: pickling them to a pool costs more than normalizing their titles.
+    Parsed chunks are collected in order, so all messages of a title reach their shard in their
+    original order, and the cards are returned in order of first appearance - exactly like the
+    serial path. Returns the cards and the number of messages read.
+    The workers' label hits are added to `classifier.label_hits`.
+    """
+    ctx = multiprocessing.get_context()
+    outbox = ctx.Queue()
+    inboxes = [ctx.Queue(maxsize=8) for _ in range(workers)]
+    processes = [
+        ctx.Process(target=_merge_shard, args=(inbox, outbox, classifier), daemon=True)
+        for inbox in inboxes
+    ]
+    for process in processes:
+        process.start()
+
+    try:
+        batches = [[] for _ in range(workers)]
+        seq = message_count = 0
+
+        def route(parsed: ParsedChunk):
+            nonlocal seq, message_count
+            count, items = parsed
+            message_count += count
+            for title, body in items:
+                shard = shard_of(title, workers)
+                batches[shard].append((seq, title, body))
+                seq += 1
+                if len(batches[shard]) >= batch_size:
+                    _put(inboxes[shard], batches[shard], processes)
+                    batches[shard] = []
+
+        if parse_in_pool:
+            with ProcessPoolExecutor(workers, mp_context=ctx, initializer=initializer, initargs=initargs) as pool:
+                # A bounded window of chunks in flight keeps a streamed mailbox flat in memory
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(parse, chunk))
+                    if len(pending) > 2 * workers:
+                        route(pending.popleft().result())
+                while pending:
+                    route(pending.popleft().result())
+        else:
+            for chunk in chunks:
+                route(parse(chunk))
+
+        for inbox, batch in zip(inboxes, batches):
+            if batch:
+                _put(inbox, batch, processes)
+            _put(inbox, None, processes)
+
+        results = []
+        while len(results) < workers:
+            try:
+                results.append(outbox.get(timeout=1))
+            except queue.Empty:
+                _raise_if_crashed(processes)
+    finally:
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    for _, label_hits in results:
+        classifier.label_hits.update(label_hits)
+    merged = sorted((entry for shard, _ in results for entry in shard), key=lambda entry: entry[0])
+    return [card for _, card in merged], message_count
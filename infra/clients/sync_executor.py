@@ -0,0 +1,210 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from infra.clients.trello_client import TrelloClient
+from infra.clients.trello_transport import ThreadTransports
+from infra.modals.card_modal import CardModal
+from infra.utils.logger_setup import get_logger
+
+logger = get_logger("SyncExecutor")
+
+# Colors of labels the sync has to create on a board; other labels are created without a color
+LABEL_COLORS = {"Urgent": "red"}
+
+
+def content_hash(title: str, description: str, labels: Iterable[str]) -> str:
+    """Digest of the synced content of a card. Equal hashes mean there is nothing to write."""
+    hasher = hashlib.blake2b(digest_size=16)
+    for part in (title, description, *sorted(set(labels))):
+        hasher.update(part.encode('utf-8'))
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+@dataclass
+class CardUpdate:
+    expected: CardModal
+    card_id: str
+    # Labels of the board card that the sync does not manage; they are kept on update
+    kept_labels: List[str]
+    description_changed: bool
+
+
+@dataclass
+class SyncPlan:
+    """The writes needed to bring the board to the expected state."""
+    creates: List[CardModal] = field(default_factory=list)
+    updates: List[CardUpdate] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def labels_needed(self) -> Set[str]:
+        cards = self.creates + [update.expected for update in self.updates]
+        return {label for card in cards for label in card.label_names}
+
+
+@dataclass
+class SyncResult:
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failures: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def is_clean(self) -> bool:
+        return not self.failures
+
+
+class TrelloSyncExecutor:
+    """
+    Pushes the expected cards to the board.
+    Board cards are matched by title; a card is only written when the content hash of its
+    title, description and sync-managed labels differs from the expected one, so re-running
+    a sync is safe and an in-sync board costs no writes. Label ids are resolved once per run
+    and the writes go through a bounded thread pool. Each pool thread writes over its own
+    transport (requests sessions are not thread-safe), all sharing the client transport's rate-limit gate.
+    """
+
+    def __init__(self, trello_client: TrelloClient, workers: int = 4, list_id: Optional[str] = None):
+        """
+        :param workers: Maximum number of concurrent write requests.
+        :param list_id: List that receives new cards (defaults to the first list of the board).
+        """
+        self.client = trello_client
+        self.transport = trello_client.transport
+        self.board_id = trello_client.board_id
+        self.workers = max(1, workers)
+        self.list_id = list_id
+
+    def sync(self, expected_cards: List[CardModal]) -> SyncResult:
+        return self.apply(self.plan(expected_cards))
+
+    def plan(self, expected_cards: List[CardModal]) -> SyncPlan:
+        """Diffs the expected cards against the board (one paged read of the board)."""
+        managed_labels = {label for card in expected_cards for label in card.label_names}
+        board_cards: Dict[str, Dict[str, Any]] = {}
+        for card_json in self.client.iter_card_json():
+            if card_json['name'] in board_cards:
+                logger.warning(f"Card '{card_json['name']}' appears more than once on the board, syncing the first one")
+                continue
+            board_cards[card_json['name']] = card_json
+
+        plan = SyncPlan()
+        for expected in expected_cards:
+            card_json = board_cards.get(expected.title)
+            if card_json is None:
+                plan.creates.append(expected)
+                continue
+
+            board_labels = [label['name'] for label in card_json.get('labels', []) if label.get('name')]
+            synced_labels = [label for label in board_labels if label in managed_labels]
+            if content_hash(card_json['name'], card_json.get('desc', ''), synced_labels) == \
+                    content_hash(expected.title, expected.description, expected.label_names):
+                plan.unchanged += 1
+                continue
+
+            plan.updates.append(CardUpdate(
+                expected=expected,
+                card_id=card_json['id'],
+                kept_labels=[label for label in board_labels if label not in managed_labels],
+                description_changed=card_json.get('desc', '') != expected.description,
+            ))
+
+        logger.info(f"Sync plan: {len(plan.creates)} to create, {len(plan.updates)} to update, "
+                    f"{plan.unchanged} unchanged")
+        return plan
+
+    def apply(self, plan: SyncPlan) -> SyncResult:
+        result = SyncResult(unchanged=plan.unchanged)
+        if not plan.creates and not plan.updates:
+            return result
+
+        label_ids = self._resolve_labels(plan.labels_needed | {
+            label for update in plan.updates for label in update.kept_labels
+        })
+        list_id = (self.list_id or self._default_list_id()) if plan.creates else None
+
+        transports = ThreadTransports(self.transport.sibling)
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="trello-sync") as pool:
+                futures = {
+                    pool.submit(self._create_card, transports, card, list_id, label_ids): ("create", card.title)
+                    for card in plan.creates
+                }
+                futures.update({
+                    pool.submit(self._update_card, transports, update, label_ids): ("update", update.expected.title)
+                    for update in plan.updates
+                })
+
+                for future in as_completed(futures):
+                    action, title = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to {action} card '{title}': {e}")
+                        result.failures.append((title, str(e)))
+                        continue
+                    if action == "create":
+                        result.created += 1
+                    else:
+                        result.updated += 1
+        finally:
+            transports.close()
+
+        logger.info(f"Sync done: {result.created} created, {result.updated} updated, "
+                    f"{result.unchanged} unchanged, {len(result.failures)} failed")
+        return result
+
+    # --- Board Helpers ---
+
+    def _resolve_labels(self, names: Set[str]) -> Dict[str, str]:
+        """Maps label names to ids, creating the labels the board does not have yet."""
+        label_ids = {}
+        for label in self.transport.get_json(f"/boards/{self.board_id}/labels", {'fields': 'name', 'limit': 1000}):
+            if label.get('name'):
+                label_ids.setdefault(label['name'], label['id'])
+
+        for name in sorted(names - label_ids.keys()):
+            logger.info(f"Creating label '{name}' on board {self.board_id}")
+            label = self.transport.send_json("POST", f"/boards/{self.board_id}/labels",
+                                             {'name': name, 'color': LABEL_COLORS.get(name)})
+            label_ids[name] = label['id']
+        return label_ids
+
+    def _default_list_id(self) -> str:
+        lists = self.transport.get_json(f"/boards/{self.board_id}/lists", {'fields': 'name'})
+        if not lists:
+            raise ValueError(f"Board {self.board_id} has no list to create cards in")
+        return lists[0]['id']
+
+    @staticmethod
+    def _create_card(transports: ThreadTransports, card: CardModal, list_id: str, label_ids: Dict[str, str]):
+        transports.get().send_json("POST", "/cards", {
+            'idList': list_id,
+            'name': card.title,
+            'desc': card.description,
+            'idLabels': [label_ids[label] for label in card.label_names],
+        })
+
+    @staticmethod
+    def _update_card(transports: ThreadTransports, update: CardUpdate, label_ids: Dict[str, str]):
+        labels = [*update.kept_labels, *update.expected.label_names]
+        body = {'idLabels': [label_ids[label] for label in labels]}
+        if update.description_changed:
+            body['desc'] = update.expected.description
+        transports.get().send_json("PUT", f"/cards/{update.card_id}", body)
+
+
+# --- Manual Run ---
+if __name__ == "__main__":
+    import os
+    from dotenv import load_dotenv
+    from infra.clients.gmail_client import GmailClient
+    load_dotenv() # Load the .env file
+
+    gmail = GmailClient(os.path.join(os.getcwd(), 'data', 'mock_gmail_data.json'))
+    executor = TrelloSyncExecutor(TrelloClient(), workers=int(os.getenv('TRELLO_SYNC_WORKERS', '4')))
+    outcome = executor.sync(gmail.get_expected_cards())
+    print(f"Created: {outcome.created}, Updated: {outcome.updated}, "
+          f"Unchanged: {outcome.unchanged}, Failed: {len(outcome.failures)}")
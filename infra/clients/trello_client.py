@@ -1,44 +1,57 @@
-import requests
 import os
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional
+from infra.clients.board_snapshot_cache import BoardSnapshotCache
+from infra.clients.trello_transport import TrelloTransport, MAX_PAGE_SIZE
 from infra.modals.card_modal import CardModal
 
+CARD_FIELDS = 'name,desc,labels,idList' # Fetch only needed fields
+
 class TrelloClient:
-    def __init__(self):
+    def __init__(self, base_url: Optional[str] = None, page_size: int = MAX_PAGE_SIZE,
+                 snapshot_dir: Optional[str] = None):
         # Load credentials from environment variables
         self.api_key = os.getenv('TRELLO_API_KEY')
         self.api_token = os.getenv('TRELLO_API_TOKEN')
         self.board_id = os.getenv('TRELLO_BOARD_ID')
-        self.base_url = "https://api.trello.com/1"
+        self.base_url = base_url or os.getenv('TRELLO_BASE_URL', "https://api.trello.com/1")
+        self.page_size = page_size
         
         if not all([self.api_key, self.api_token, self.board_id]):
             raise ValueError("Missing Trello credentials in .env file")
 
+        # One pooled, rate-limit aware session for every call of this client
+        self.transport = TrelloTransport(self.base_url, self.api_key, self.api_token)
+
+        # Optional on-disk board snapshot, refreshed incrementally from the board activity
+        snapshot_dir = snapshot_dir or os.getenv('TRELLO_SNAPSHOT_DIR')
+        self.snapshot_cache = BoardSnapshotCache(self.transport, snapshot_dir, CARD_FIELDS) if snapshot_dir else None
+
+    def iter_card_json(self) -> Iterator[Dict[str, Any]]:
+        """Yields the raw card JSON (id, name, desc, labels, idList) of every card on the board."""
+        if self.snapshot_cache:
+            return iter(self.snapshot_cache.get_cards(self.board_id))
+
+        path = f"/boards/{self.board_id}/cards"
+        return self.transport.iter_paginated(path, {'fields': CARD_FIELDS}, page_size=self.page_size)
+
     def get_all_cards(self) -> List[CardModal]:
         """Fetches all cards from the board and converts them to CardModal objects."""
-        url = f"{self.base_url}/boards/{self.board_id}/cards"
-        query = {
-            'key': self.api_key,
-            'token': self.api_token,
-            'fields': 'name,desc,labels,idList' # Fetch only needed fields
-        }
-        
-        response = requests.get(url, params=query)
-        response.raise_for_status()
-        
         trello_cards = []
-        for card_json in response.json():
-            label_names = [label['name'] for label in card_json.get('labels', []) if label.get('name')]
-            
-            card_obj = CardModal(
-                title=card_json['name'],
-                description=card_json['desc'],
-                labels=label_names
-            )
-            trello_cards.append(card_obj)
+        for card_json in self.iter_card_json():
+            trello_cards.append(self.to_card_modal(card_json))
             
         return trello_cards
 
+    @staticmethod
+    def to_card_modal(card_json: dict) -> CardModal:
+        label_names = [label['name'] for label in card_json.get('labels', []) if label.get('name')]
+        
+        return CardModal(
+            title=card_json['name'],
+            description=card_json['desc'],
+            labels=label_names
+        )
+
 # --- Debugging ---
 if __name__ == "__main__":
     from dotenv import load_dotenv
@@ -48,4 +61,4 @@ if __name__ == "__main__":
     cards = client.get_all_cards()
     print(f"Connected to Trello! Found {len(cards)} cards on the board.")
     for card in cards[:3]: # Print first 3
-        print(f"- {card.title} (Labels: {card.labels})")
\ No newline at end of file
+        print(f"- {card.title} (Labels: {card.labels})")
@@ -0,0 +1,201 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from infra.utils.json_stream import JsonStreamReader
+from infra.utils.logger_setup import get_logger
+
+logger = get_logger("TrelloTransport")
+
+# Trello caps 'limit' at 1000 items per page
+MAX_PAGE_SIZE = 1000
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# A 5xx or dropped connection may come after a POST was applied, so POSTs only retry on 429
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE"}
+
+# Trello reports the remaining budget of both the key and the token rate-limit windows
+RATE_LIMIT_WINDOWS = ("api-token", "api-key")
+
+
+class RateLimitGate:
+    """
+    Rate-limit state of one API key/token: the moment before which no request may be sent.
+    Trello's windows are per key and token, not per connection, so every transport of a client
+    (e.g. one per thread) shares one gate; a window exhausted on any of them pauses them all.
+    """
+
+    def __init__(self):
+        # Monotonic timestamp before which no request may be sent (rate-limit window exhausted)
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            logger.info(f"Rate-limit window exhausted, waiting {delay:.2f}s")
+            time.sleep(delay)
+
+    def track(self, response: requests.Response):
+        """Pauses the next requests when Trello reports an exhausted rate-limit window."""
+        for window in RATE_LIMIT_WINDOWS:
+            remaining = response.headers.get(f"x-rate-limit-{window}-remaining")
+            interval_ms = response.headers.get(f"x-rate-limit-{window}-interval-ms")
+            if remaining is not None and interval_ms is not None and int(remaining) <= 0:
+                with self._lock:
+                    self._resume_at = max(self._resume_at, time.monotonic() + int(interval_ms) / 1000)
+
+
+class TrelloTransport:
+    """
+    HTTP layer for the Trello REST API.
+    Holds one pooled keep-alive session, honours Trello's rate-limit headers,
+    retries throttled/failed requests and decodes list responses as a stream.
+    A session is not thread-safe: threads use their own transport (see ThreadTransports),
+    sharing the rate-limit gate.
+    """
+
+    def __init__(self, base_url: str, api_key: str, api_token: str, pool_size: int = 10,
+                 max_retries: int = 5, backoff_seconds: float = 0.5, timeout: float = 30,
+                 gate: Optional[RateLimitGate] = None):
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.timeout = timeout
+        self.gate = gate or RateLimitGate()
+        self._credentials = (api_key, api_token)
+
+        self.session = requests.Session()
+        self.session.params = {'key': api_key, 'token': api_token}
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self):
+        self.session.close()
+
+    def sibling(self, pool_size: int = 1) -> "TrelloTransport":
+        """A transport with its own session, the same credentials and settings, and this one's rate-limit gate."""
+        return TrelloTransport(self.base_url, *self._credentials, pool_size=pool_size,
+                               max_retries=self.max_retries, backoff_seconds=self.backoff_seconds,
+                               timeout=self.timeout, gate=self.gate)
+
+    def request(self, method: str, path: str, params: Optional[Dict[str, Any]] = None,
+                stream: bool = False, **kwargs) -> requests.Response:
+        """Sends a request, backing off on 429/5xx responses. Raises for any other error status."""
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        retry_statuses = RETRY_STATUSES if idempotent else {429}
+
+        for attempt in range(self.max_retries + 1):
+            self.gate.wait()
+            try:
+                response = self.session.request(method, url, params=params, stream=stream,
+                                                timeout=self.timeout, **kwargs)
+            except requests.ConnectionError as e:
+                if attempt == self.max_retries or not idempotent:
+                    raise
+                delay = self._backoff_delay(attempt)
+                logger.warning(f"Connection error on {method} {path}: {e}. Retrying in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+
+            self.gate.track(response)
+
+            if response.status_code in retry_statuses and attempt < self.max_retries:
+                delay = self._retry_after(response)
+                if delay is None:
+                    delay = self._backoff_delay(attempt)
+                logger.warning(f"Trello answered {response.status_code} on {method} {path}. Retrying in {delay:.2f}s")
+                response.close()
+                time.sleep(delay)
+                continue
+
+            response.raise_for_status()
+            return response
+
+    def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        with self.request("GET", path, params=params) as response:
+            return response.json()
+
+    def send_json(self, method: str, path: str, body: Dict[str, Any]) -> Any:
+        """Sends a JSON body (POST/PUT) and returns the decoded response."""
+        with self.request(method, path, json=body) as response:
+            return response.json()
+
+    def iter_json_array(self, path: str, params: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+        """Yields the items of a JSON array response while it is still being downloaded."""
+        with self.request("GET", path, params=params, stream=True) as response:
+            response.raw.decode_content = True
+            yield from JsonStreamReader(response.raw).iter_array()
+
+    def iter_paginated(self, path: str, params: Optional[Dict[str, Any]] = None,
+                       page_size: int = MAX_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Pages through a collection endpoint with 'limit'/'before'.
+        Each page asks for items created before the oldest id seen so far.
+        """
+        page_size = min(page_size, MAX_PAGE_SIZE)
+        before = None
+
+        while True:
+            page_params = dict(params or {}, limit=page_size)
+            if before:
+                page_params['before'] = before
+
+            count = 0
+            for item in self.iter_json_array(path, page_params):
+                count += 1
+                if before is None or item['id'] < before:
+                    before = item['id']
+                yield item
+
+            if count < page_size:
+                return
+
+    # --- Retry Helpers ---
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        value = response.headers.get("Retry-After")
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+    def _backoff_delay(self, attempt: int) -> float:
+        return self.backoff_seconds * (2 ** attempt)
+
+
+class ThreadTransports:
+    """
+    One TrelloTransport per thread, made by `factory` on the thread's first request.
+    requests sessions are not thread-safe, so a pool of threads gets one keep-alive session per
+    thread instead of sharing one; the factory should hand every transport the same RateLimitGate.
+    """
+
+    def __init__(self, factory: Callable[[], TrelloTransport]):
+        self._factory = factory
+        self._local = threading.local()
+        self._transports: List[TrelloTransport] = []
+        self._lock = threading.Lock()
+
+    def get(self) -> TrelloTransport:
+        transport = getattr(self._local, "transport", None)
+        if transport is None:
+            transport = self._local.transport = self._factory()
+            with self._lock:
+                self._transports.append(transport)
+        return transport
+
+    def __len__(self) -> int:
+        return len(self._transports)
+
+    def close(self):
+        with self._lock:
+            transports, self._transports = self._transports, []
+        for transport in transports:
+            transport.close()
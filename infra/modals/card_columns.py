@@ -0,0 +1,57 @@
+from typing import Dict, Iterable, Iterator, List, Tuple
+from infra.modals.card_modal import CardModal, LABELS
+
+
+class CardColumns:
+    """
+    Columnar collection of cards: one list per field instead of one object per card.
+    Meant for bulk operations over millions of cards (lookups, label filters, counts).
+    Labels are kept as the shared per-sequence tuples, so rows keep their label order.
+    """
+
+    def __init__(self):
+        self.titles: List[str] = []
+        self.descriptions: List[str] = []
+        self.label_sequences: List[Tuple[str, ...]] = []
+        self.label_masks: List[int] = []
+
+    @classmethod
+    def from_cards(cls, cards: Iterable[CardModal]) -> "CardColumns":
+        columns = cls()
+        for card in cards:
+            columns.append(card)
+        return columns
+
+    def append(self, card: CardModal):
+        self.titles.append(card.title)
+        self.descriptions.append(card.description)
+        self.label_sequences.append(card.label_names)
+        self.label_masks.append(card.label_mask)
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def __getitem__(self, index: int) -> CardModal:
+        return CardModal(self.titles[index], self.descriptions[index], self.label_sequences[index])
+
+    def __iter__(self) -> Iterator[CardModal]:
+        return (self[index] for index in range(len(self)))
+
+    def index_by_title(self) -> Dict[str, int]:
+        """Key = title, Value = row of its last occurrence."""
+        return {title: index for index, title in enumerate(self.titles)}
+
+    def rows_with_label(self, label: str) -> List[int]:
+        bit = LABELS.bit(label)
+        return [index for index, mask in enumerate(self.label_masks) if mask & bit]
+
+    def label_counts(self) -> Dict[str, int]:
+        """Number of cards carrying each label."""
+        counts: Dict[str, int] = {}
+        sequence_counts: Dict[Tuple[str, ...], int] = {}
+        for sequence in self.label_sequences:
+            sequence_counts[sequence] = sequence_counts.get(sequence, 0) + 1
+        for sequence, count in sequence_counts.items():
+            for name in sequence:
+                counts[name] = counts.get(name, 0) + count
+        return counts
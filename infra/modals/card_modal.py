@@ -1,16 +1,143 @@
-from dataclasses import dataclass, field
-from typing import List
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class LabelTable:
+    """
+    Process-wide table of label names. Every name gets one bit, so label checks are int
+    operations, and every distinct label sequence is one shared tuple instead of a per-card list.
+    """
+
+    def __init__(self):
+        self._bits: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._decoded: Dict[int, Tuple[str, ...]] = {0: ()}
+        self._sequences: Dict[Tuple[str, ...], Tuple[Tuple[str, ...], int]] = {(): ((), 0)}
+        self._lock = threading.Lock()
+
+    def bit(self, name: str) -> int:
+        bit = self._bits.get(name)
+        if bit is None:
+            with self._lock:
+                bit = self._bits.get(name)
+                if bit is None:
+                    bit = 1 << len(self._names)
+                    self._names.append(sys.intern(name))
+                    self._bits[name] = bit
+        return bit
+
+    def mask(self, names: Iterable[str]) -> int:
+        mask = 0
+        for name in names:
+            mask |= self.bit(name)
+        return mask
+
+    def sequence(self, names: Iterable[str]) -> Tuple[Tuple[str, ...], int]:
+        """The shared tuple of `names` (duplicates dropped, first occurrence order kept) and its mask."""
+        names = tuple(dict.fromkeys(names))
+        entry = self._sequences.get(names)
+        if entry is None:
+            entry = self._sequences.setdefault(names, (tuple(sys.intern(name) for name in names), self.mask(names)))
+        return entry
+
+    def names(self, mask: int) -> Tuple[str, ...]:
+        """Label names of a mask, in the order the labels were first registered."""
+        decoded = self._decoded.get(mask)
+        if decoded is None:
+            decoded = tuple(name for index, name in enumerate(self._names) if mask >> index & 1)
+            self._decoded[mask] = decoded
+        return decoded
+
+
+LABELS = LabelTable()
+
+
+def _writes_through(method_name: str):
+    method = getattr(list, method_name)
+
+    def mutate(self, *args):
+        result = method(self, *args)
+        self._card.labels = self
+        return self if method_name.startswith("__i") else result
+    mutate.__name__ = method_name
+    return mutate
+
+
+class LabelList(list):
+    """
+    The labels of a card as a plain list, built from the card's shared label tuple.
+    Changing it (append, remove, ...) updates the card, like the per-card list it replaces.
+    """
+    __slots__ = ("_card",)
+
+    def __init__(self, card: "CardModal", labels: Iterable[str]):
+        super().__init__(labels)
+        self._card = card
+
+    for _name in ("append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse",
+                  "__setitem__", "__delitem__", "__iadd__", "__imul__"):
+        locals()[_name] = _writes_through(_name)
+    del _name
+
 
-@dataclass
 class CardModal:
     """
     Represents the expected state of a Trello Card after processing emails.
+    Compact layout: __slots__, interned titles, and labels as a tuple shared by every card with
+    the same labels, plus their bitmask against LABELS. `labels` still reads as a list.
     """
-    title: str
-    description: str
-    labels: List[str] = field(default_factory=List)
+    __slots__ = ("_title", "description", "_labels", "_label_mask")
+
+    def __init__(self, title: str, description: str, labels: Optional[Iterable[str]] = None):
+        self.title = title
+        self.description = description
+        self.labels = labels or ()
+
+    @property
+    def title(self) -> str:
+        return self._title
+
+    @title.setter
+    def title(self, value: str):
+        # Expected and actual cards share their titles, so equal titles share one string object
+        self._title = sys.intern(value)
+
+    @property
+    def labels(self) -> List[str]:
+        """Label names of the card, in the order they were added (changes to the list update the card)."""
+        return LabelList(self, self._labels)
+
+    @property
+    def label_names(self) -> Tuple[str, ...]:
+        """The card's shared label tuple, for read-only bulk use without building a list."""
+        return self._labels
+
+    @labels.setter
+    def labels(self, names: Iterable[str]):
+        self._labels, self._label_mask = LABELS.sequence(names)
+
+    @property
+    def label_mask(self) -> int:
+        return self._label_mask
 
     def add_label(self, label: str):
-        if label not in self.labels:
-            self.labels.append(label)
-    
\ No newline at end of file
+        if not self.has_label(label):
+            self.labels = (*self._labels, label)
+
+    def has_label(self, label: str) -> bool:
+        return bool(self._label_mask & LABELS.bit(label))
+
+    def __eq__(self, other):
+        if not isinstance(other, CardModal):
+            return NotImplemented
+        return (self._title, self.description, self._labels) == (other._title, other.description, other._labels)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"CardModal(title={self._title!r}, description={self.description!r}, labels={self.labels!r})"
+
+    # Label bits are only meaningful inside one process; pickle (e.g. for merge workers) by name
+    def __reduce__(self):
+        return (CardModal, (self._title, self.description, self._labels))
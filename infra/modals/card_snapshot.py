@@ -0,0 +1,40 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass
+class LabelSnapshot:
+    text: str
+    title: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        """The label as displayed: its text, or its 'title' attribute for color-only labels."""
+        return self.text or self.title or ""
+
+
+@dataclass
+class CardSnapshot:
+    """
+    Plain-Python copy of one board card, captured from the DOM in a single browser round trip.
+    `index` is the card's position among the board's card containers.
+    """
+    index: int
+    title: str
+    text: str
+    list_name: Optional[str] = None
+    labels: List[LabelSnapshot] = field(default_factory=list)
+    title_attributes: List[str] = field(default_factory=list)
+    html_has_red: bool = False
+
+    @property
+    def label_names(self) -> List[str]:
+        return [label.name for label in self.labels if label.name]
+
+    def has_label(self, label_text: str) -> bool:
+        """
+        Same match as the former locator-based filter:
+        any text of the card (case insensitive) or any 'title' attribute containing `label_text`.
+        """
+        return label_text.lower() in self.text.lower() or \
+            any(label_text in title for title in self.title_attributes)
@@ -1,6 +1,9 @@
 from infra.pages.base_page import BasePage
-from typing import List, Dict
+from typing import List, Dict, Optional
 import allure
+from playwright.sync_api import Locator
+from infra.modals.card_snapshot import CardSnapshot, LabelSnapshot
+from infra.pages.response_index import TrelloResponseIndex
 from infra.utils.logger_setup import get_logger
 
 logger = get_logger("BasePage")
@@ -15,24 +18,72 @@ class BoardPage(BasePage):
     MODAL_DESC_P = '[class="ak-renderer-document"]'
     MODAL_LABELS_LIST = "[data-testid='card-label']"
     MODAL_COLUMN_STATUS = "button:has([data-testid='DownIcon'])"
+    CARD_LABEL = "[data-testid='compact-card-label']"
+    LIST_CONTAINER = "[data-testid='list']"
+    LIST_NAME = "[data-testid='list-name']"
+
+    # Collects every card of the board in ONE evaluation instead of several round trips per card
+    SNAPSHOT_SCRIPT = """
+    ([cardSelector, nameSelector, labelSelector, listSelector, listNameSelector]) =>
+        Array.from(document.querySelectorAll(cardSelector)).map((card, index) => {
+            const text = card.innerText || "";
+            const nameEl = card.querySelector(nameSelector);
+            const listEl = card.closest(listSelector);
+            const listNameEl = listEl ? listEl.querySelector(listNameSelector) : null;
+            return {
+                index,
+                title: nameEl ? nameEl.innerText.trim() : text.split("\\n")[0],
+                text,
+                list_name: listNameEl ? listNameEl.innerText.trim() : null,
+                labels: Array.from(card.querySelectorAll(labelSelector)).map(label => ({
+                    text: (label.innerText || "").trim(),
+                    title: label.getAttribute("title"),
+                })),
+                title_attributes: Array.from(card.querySelectorAll("[title]")).map(el => el.getAttribute("title")),
+                html_has_red: card.innerHTML.includes("red"),
+            };
+        })
+    """
+
+    def __init__(self, page, response_index: Optional[TrelloResponseIndex] = None):
+        """
+        :param response_index: Index of the JSON the board page downloaded (attached before navigation).
+                               When given, card detail queries are answered from it.
+        """
+        super().__init__(page)
+        self.response_index = response_index
+
+    @allure.step("Take a snapshot of all board cards")
+    def get_board_snapshot(self) -> List[CardSnapshot]:
+        """
+        Returns a plain Python record for every card on the board (title, text, labels,
+        list name and attributes), captured with a single page.evaluate call.
+        """
+        raw_cards = self.page.evaluate(
+            self.SNAPSHOT_SCRIPT,
+            [self.CARD_CONTAINER, self.CARD_ELEMENT, self.CARD_LABEL, self.LIST_CONTAINER, self.LIST_NAME]
+        )
+        snapshot = []
+        for raw in raw_cards:
+            labels = [LabelSnapshot(**label) for label in raw.pop("labels")]
+            snapshot.append(CardSnapshot(labels=labels, **raw))
+
+        logger.info(f"Captured snapshot of {len(snapshot)} cards")
+        return snapshot
+
+    def get_card_snapshots_with_label(self, label_text: str) -> List[CardSnapshot]:
+        """Filters the board snapshot in memory - no browser round trip per card."""
+        return [card for card in self.get_board_snapshot() if card.has_label(label_text)]
 
     @allure.step("Get all cards containing label: {label_text}")
-    def get_cards_with_label(self, label_text: str) -> List[any]:
+    def get_cards_with_label(self, label_text: str) -> List[Locator]:
         """
         Filters all visible cards to find those that have the specific label.
         Returns a list of Playwright Locator objects.
         """
-        all_cards = self.page.locator(self.CARD_CONTAINER).all()
-        matching_cards = []
-
-        for card in all_cards:
-            # Check if this card has the label (by text or color attribute if needed)
-            # Trello labels often have the text inside them or in title attribute
-            if card.get_by_text(label_text).count() > 0 or \
-               card.locator(f"[title*='{label_text}']").count() > 0:
-                matching_cards.append(card)
-        
-        return matching_cards
+        # Trello labels often have the text inside them or in title attribute
+        all_cards = self.page.locator(self.CARD_CONTAINER)
+        return [all_cards.nth(card.index) for card in self.get_card_snapshots_with_label(label_text)]
 
     @allure.step("Open card by title: {title}")
     def open_card_by_title(self, title: str):
@@ -72,6 +123,24 @@ class BoardPage(BasePage):
             "status": status_text
         }
 
+    @allure.step("Get details of card: {title}")
+    def get_card_details(self, title: str) -> Dict[str, any]:
+        """
+        Returns the card's title, description, labels and status.
+        Answered from the captured network data when possible, otherwise read from the card modal.
+        """
+        if self.response_index is not None:
+            details = self.response_index.card_details(title)
+            if details is not None:
+                return details
+            logger.info(f"Card '{title}' not in captured responses, falling back to the modal")
+
+        self.open_card_by_title(title)
+        try:
+            return self.get_modal_details()
+        finally:
+            self.close_modal()
+
     @allure.step("Close card modal")
     def close_modal(self):
         self.click(self.CLOSE_MODAL_BTN)
\ No newline at end of file
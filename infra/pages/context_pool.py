@@ -0,0 +1,169 @@
+import asyncio
+import queue
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+from playwright.async_api import Browser, Page, async_playwright
+from infra.pages.board_page import BoardPage
+from infra.pages.response_index import TrelloResponseIndex
+from infra.utils.logger_setup import get_logger
+
+logger = get_logger("ContextPool")
+
+
+class BrowserContextPool:
+    """
+    Pool of N isolated, already authenticated contexts of ONE browser, each with a page on the board.
+
+    Every context is created from the saved `storage_state` (no login), so the pool also works
+    inside pytest-xdist workers. The sync Playwright API of the test thread cannot drive pages
+    concurrently, so the pool runs Playwright's async API on a dedicated thread: one browser,
+    `size` contexts, and one task per context taking cards off a shared queue.
+    Card details come from the board JSON a context captured, or from the card modal.
+    """
+
+    def __init__(self, storage_state: str, board_url: str, size: int = 4, browser_name: str = "chromium",
+                 headless: bool = True, context_args: Optional[Dict[str, Any]] = None,
+                 start_timeout: float = 60):
+        self.storage_state = storage_state
+        self.board_url = board_url
+        self.size = size
+        self.browser_name = browser_name
+        self.headless = headless
+        self.context_args = context_args or {"viewport": {"width": 1920, "height": 1080}}
+        self.start_timeout = start_timeout
+
+        self._ready: "queue.Queue" = queue.Queue()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pages: List[Tuple[Page, TrelloResponseIndex]] = []
+
+    def __enter__(self) -> "BrowserContextPool":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self):
+        self._loop = asyncio.new_event_loop()
+        self._stop = asyncio.Event()
+        self._thread = threading.Thread(target=self._run, name="context-pool", daemon=True)
+        self._thread.start()
+
+        try:
+            error = self._ready.get(timeout=self.start_timeout)
+        except queue.Empty:
+            self.close()
+            raise TimeoutError(f"Context pool did not open the board within {self.start_timeout}s")
+        if error is not None:
+            self.close()
+            raise error
+        logger.info(f"Context pool ready with {self.size} authenticated pages in one browser")
+
+    def close(self):
+        if self._thread is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        except RuntimeError:
+            pass  # The pool thread already ended and closed its loop
+        self._thread.join(timeout=30)
+        self._thread = None
+
+    def inspect_cards(self, titles: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Gets every card's details (captured board data, or its modal), spread over the pool, keyed by title.
+        A card that could not be inspected maps to {"error": "..."}.
+        """
+        return asyncio.run_coroutine_threadsafe(self._inspect(titles), self._loop).result()
+
+    # --- Pool Thread ---
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._main())
+        finally:
+            self._loop.close()
+
+    async def _main(self):
+        try:
+            async with async_playwright() as playwright:
+                browser = await getattr(playwright, self.browser_name).launch(headless=self.headless)
+                try:
+                    self._pages = await asyncio.gather(*(self._open_page(browser) for _ in range(self.size)))
+                except Exception as e:
+                    # Closing the browser also stops the contexts still opening
+                    await browser.close()
+                    self._ready.put(e)
+                    return
+
+                self._ready.put(None)
+                await self._stop.wait()
+                await browser.close()
+        except Exception as e:
+            # Playwright or the browser failed to start at all
+            self._ready.put(e)
+
+    async def _open_page(self, browser: Browser) -> Tuple[Page, TrelloResponseIndex]:
+        context = await browser.new_context(storage_state=self.storage_state, **self.context_args)
+        page = await context.new_page()
+        response_index = TrelloResponseIndex()
+        response_index.attach_async(page)
+        await page.goto(self.board_url)
+        await page.wait_for_selector("#board", timeout=15000)
+        return page, response_index
+
+    async def _inspect(self, titles: List[str]) -> Dict[str, Dict[str, Any]]:
+        pending = deque(titles)
+        details = {}
+
+        async def serve(page: Page, response_index: TrelloResponseIndex):
+            while pending:
+                title = pending.popleft()
+                details[title] = await self._card_details(page, response_index, title)
+
+        await asyncio.gather(*(serve(page, response_index) for page, response_index in self._pages))
+        return details
+
+    async def _card_details(self, page: Page, response_index: TrelloResponseIndex, title: str) -> Dict[str, Any]:
+        card_details = response_index.card_details(title)
+        if card_details is not None:
+            return card_details
+        try:
+            return await self._modal_details(page, title)
+        except Exception as e:
+            logger.error(f"Pool worker failed to inspect '{title}': {e}")
+            try:
+                await page.keyboard.press("Escape")
+            except Exception:
+                pass
+            return {"error": str(e)}
+
+    @staticmethod
+    async def _modal_details(page: Page, title: str) -> Dict[str, Any]:
+        """Async counterpart of BoardPage.open_card_by_title + get_modal_details + close_modal."""
+        card_locator = page.locator(BoardPage.CARD_ELEMENT).filter(has_text=title).first
+        await card_locator.wait_for(state="visible", timeout=5000)
+        await card_locator.click()
+        await page.wait_for_selector(BoardPage.MODAL_TITLE_INPUT)
+        try:
+            desc_text = ""
+            if await page.locator(BoardPage.MODAL_DESC_P).count() > 0:
+                desc_text = await page.locator(BoardPage.MODAL_DESC_P).inner_text()
+            try:
+                status_element = page.locator(BoardPage.MODAL_COLUMN_STATUS).nth(1)
+                await status_element.wait_for(state="visible", timeout=2000)
+                status_text = (await status_element.inner_text()).strip()
+            except Exception:
+                status_text = "UNKNOWN"
+            return {
+                "title": await page.input_value(BoardPage.MODAL_TITLE_INPUT),
+                "description": desc_text,
+                "labels": await page.locator(BoardPage.MODAL_LABELS_LIST).all_inner_texts(),
+                "status": status_text,
+            }
+        finally:
+            await page.click(BoardPage.CLOSE_MODAL_BTN)
@@ -0,0 +1,105 @@
+import re
+from typing import Any, Dict, List, Optional
+from infra.utils.logger_setup import get_logger
+
+logger = get_logger("ResponseIndex")
+
+
+class TrelloResponseIndex:
+    """
+    Indexes the board/card/list JSON that the Trello web app downloads while the board loads.
+    Attach it to the page BEFORE navigating; afterwards card details are plain dict lookups.
+    """
+    # REST payloads (/1/boards/..., /1/cards/..., /1/lists/...) and the GraphQL gateway
+    URL_PATTERN = re.compile(r"/1/(boards?|cards|lists)/|/gateway/api/graphql", re.IGNORECASE)
+
+    def __init__(self):
+        self.cards_by_id: Dict[str, dict] = {}
+        self.card_ids_by_name: Dict[str, str] = {}
+        self.lists_by_id: Dict[str, dict] = {}
+        self.labels_by_id: Dict[str, dict] = {}
+
+    def attach(self, page):
+        page.on("response", self._on_response)
+
+    def attach_async(self, page):
+        """attach() for a page of Playwright's async API."""
+        page.on("response", self._on_async_response)
+
+    def __len__(self) -> int:
+        return len(self.cards_by_id)
+
+    def _on_response(self, response):
+        if not self._is_indexed(response):
+            return
+        try:
+            self.ingest(response.json())
+        except Exception as e:
+            # Redirects, aborted or non-JSON bodies are simply not indexed
+            logger.debug(f"Skipped response {response.url}: {e}")
+
+    async def _on_async_response(self, response):
+        if not self._is_indexed(response):
+            return
+        try:
+            self.ingest(await response.json())
+        except Exception as e:
+            logger.debug(f"Skipped response {response.url}: {e}")
+
+    def _is_indexed(self, response) -> bool:
+        return bool(self.URL_PATTERN.search(response.url)) and "json" in response.headers.get("content-type", "")
+
+    # --- Indexing ---
+
+    def ingest(self, payload: Any):
+        """Walks a JSON payload and indexes every card, list and label object found in it."""
+        stack = [payload]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(node)
+                continue
+            if not isinstance(node, dict):
+                continue
+
+            self._index_object(node)
+            stack.extend(value for value in node.values() if isinstance(value, (dict, list)))
+
+    def _index_object(self, node: dict):
+        if "id" not in node or "name" not in node:
+            return
+        if "idList" in node and ("desc" in node or "idLabels" in node):
+            # A later (e.g. single-card) payload may carry more fields than the board one
+            card = self.cards_by_id.setdefault(node["id"], {})
+            card.update(node)
+            self.card_ids_by_name[node["name"]] = node["id"]
+        elif "color" in node and "idBoard" in node:
+            self.labels_by_id[node["id"]] = node
+        elif "idBoard" in node and "pos" in node:
+            self.lists_by_id[node["id"]] = node
+
+    # --- Queries ---
+
+    def find_card(self, title: str) -> Optional[dict]:
+        card_id = self.card_ids_by_name.get(title)
+        return self.cards_by_id.get(card_id) if card_id else None
+
+    def card_details(self, title: str) -> Optional[Dict[str, Any]]:
+        """Same shape as BoardPage.get_modal_details(), or None if the card was not captured."""
+        card = self.find_card(title)
+        if card is None:
+            return None
+
+        trello_list = self.lists_by_id.get(card.get("idList"), {})
+        return {
+            "title": card["name"],
+            "description": card.get("desc", ""),
+            "labels": self._label_names(card),
+            "status": trello_list.get("name", "UNKNOWN"),
+        }
+
+    def _label_names(self, card: dict) -> List[str]:
+        if card.get("labels"):
+            return [label["name"] for label in card["labels"] if label.get("name")]
+        return [self.labels_by_id[label_id]["name"] for label_id in card.get("idLabels", [])
+                if self.labels_by_id.get(label_id, {}).get("name")]
@@ -0,0 +1,143 @@
+import json
+import os
+import time
+from typing import Callable, List, Optional
+import requests
+from infra.utils.file_lock import file_lock
+from infra.utils.logger_setup import get_logger
+
+logger = get_logger("AuthState")
+
+# Cookies that carry the Trello / Atlassian login session
+SESSION_COOKIES = {"token", "cloud.session.token"}
+SESSION_DOMAINS = ("trello.com", "atlassian.com")
+DEFAULT_CHECK_URL = "https://trello.com/1/members/me?fields=id"
+
+
+class AuthStateManager:
+    """
+    Keeps the saved Playwright storage state (state.json) usable without rendering a page:
+    1. the session cookies' expiry dates are checked locally,
+    2. one lightweight authenticated API request confirms the session (at most every `revalidate_seconds`),
+    3. a stale state is refreshed under a file lock, so parallel workers share a single login.
+    The time of the last successful verification is kept next to the state file.
+    """
+
+    def __init__(self, state_path: str = "state.json", check_url: Optional[str] = DEFAULT_CHECK_URL,
+                 revalidate_seconds: int = 900, timeout: float = 5):
+        self.state_path = state_path
+        self.meta_path = f"{state_path}.meta"
+        self.lock_path = f"{state_path}.lock"
+        self.check_url = check_url
+        self.revalidate_seconds = revalidate_seconds
+        self.timeout = timeout
+
+    @classmethod
+    def from_env(cls, state_path: str = "state.json") -> "AuthStateManager":
+        """AUTH_CHECK_URL overrides the validation request ('' disables it); AUTH_REVALIDATE_SECONDS its interval."""
+        return cls(
+            state_path=state_path,
+            check_url=os.getenv("AUTH_CHECK_URL", DEFAULT_CHECK_URL) or None,
+            revalidate_seconds=int(os.getenv("AUTH_REVALIDATE_SECONDS", "900")),
+        )
+
+    def ensure_valid(self, refresh: Callable[[str], None]) -> str:
+        """
+        Returns the path of a valid storage state, calling `refresh(state_path)` (a login that
+        saves the state) when it is missing or stale. Raises if the refreshed state is still invalid.
+        """
+        if self.is_valid():
+            return self.state_path
+
+        with file_lock(self.lock_path):
+            # Another worker may have refreshed the state while we waited for the lock
+            if self.is_valid():
+                logger.info("Storage state was refreshed by another worker")
+                return self.state_path
+
+            logger.warning("Storage state is missing or expired, logging in again...")
+            refresh(self.state_path)
+            self._forget_verification()
+
+            if not self.is_valid():
+                raise Exception("CRITICAL: Authentication state is still invalid after a fresh login.")
+        return self.state_path
+
+    def is_valid(self) -> bool:
+        if not os.path.exists(self.state_path):
+            return False
+        if self._recently_verified():
+            return True
+
+        cookies = self._session_cookies()
+        if not self._has_unexpired(cookies):
+            logger.warning(f"No unexpired session cookie in {self.state_path}")
+            return False
+
+        if self.check_url and not self._verify_online():
+            return False
+
+        self._record_verification()
+        return True
+
+    # --- Checks ---
+
+    def _session_cookies(self) -> List[dict]:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                cookies = json.load(f).get("cookies", [])
+        except (OSError, ValueError):
+            return []
+        return [
+            cookie for cookie in cookies
+            if cookie.get("name") in SESSION_COOKIES
+            and cookie.get("domain", "").lstrip(".").endswith(SESSION_DOMAINS)
+        ]
+
+    @staticmethod
+    def _has_unexpired(cookies: List[dict]) -> bool:
+        now = time.time()
+        # expires == -1 marks a browser-session cookie, which never expires on its own
+        return any(cookie.get("expires", -1) == -1 or cookie["expires"] > now for cookie in cookies)
+
+    def _verify_online(self) -> bool:
+        """One small authenticated request instead of a full board render."""
+        jar = requests.cookies.RequestsCookieJar()
+        for cookie in self._session_cookies():
+            jar.set(cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/"))
+        try:
+            response = requests.get(self.check_url, cookies=jar, timeout=self.timeout)
+        except requests.RequestException as e:
+            # No verdict without network; the cookie check already passed, so let the run continue
+            logger.warning(f"Could not verify session online ({e}), trusting cookie expiry")
+            return True
+
+        if response.status_code in (401, 403):
+            logger.warning(f"Session rejected by {self.check_url} ({response.status_code})")
+            return False
+        if not response.ok:
+            # Server errors and rate limits say nothing about the session itself
+            logger.warning(f"Could not verify session online ({response.status_code}), trusting cookie expiry")
+        return True
+
+    # --- Verification Record ---
+
+    def _recently_verified(self) -> bool:
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return meta.get("state_mtime") == os.path.getmtime(self.state_path) and \
+            time.time() - meta.get("verified_at", 0) < self.revalidate_seconds
+
+    def _record_verification(self):
+        meta = {"verified_at": time.time(), "state_mtime": os.path.getmtime(self.state_path)}
+        tmp_path = f"{self.meta_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def _forget_verification(self):
+        if os.path.exists(self.meta_path):
+            os.remove(self.meta_path)
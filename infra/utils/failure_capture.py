@@ -0,0 +1,68 @@
+import os
+import tempfile
+from collections import deque
+from typing import Deque, Tuple
+import allure
+from infra.utils.logger_setup import get_logger
+
+logger = get_logger("FailureCapture")
+
+
+def capture_mode() -> str:
+    """CAPTURE_MODE=on-failure (default) keeps artifacts of failed tests only; 'video' records every test."""
+    return os.getenv("CAPTURE_MODE", "on-failure").lower()
+
+
+class FailureCapture:
+    """
+    Failure-only evidence for one test:
+    - a Playwright trace (DOM snapshots + actions) recorded to a temp file and dropped on success,
+    - a bounded ring buffer of screenshots taken at checkpoints and at soft-assert failures.
+    Nothing is written to the Allure results unless the test or its SoftAssert failed.
+    """
+
+    def __init__(self, page, max_screenshots: int = 5, trace_screenshots: bool = False):
+        self.page = page
+        self.trace_screenshots = trace_screenshots
+        self._screenshots: Deque[Tuple[str, bytes]] = deque(maxlen=max_screenshots)
+        self._failure_shots = 0
+        self._tracing = False
+
+    def start(self):
+        try:
+            self.page.context.tracing.start(screenshots=self.trace_screenshots, snapshots=True)
+            self._tracing = True
+        except Exception as e:
+            logger.warning(f"Could not start tracing: {e}")
+
+    def checkpoint(self, name: str):
+        """Keeps a screenshot in the ring buffer (the oldest one is dropped when it is full)."""
+        try:
+            self._screenshots.append((name, self.page.screenshot()))
+        except Exception as e:
+            logger.warning(f"Could not take checkpoint screenshot '{name}': {e}")
+
+    def on_soft_assert_failure(self, message: str):
+        # Only the first few failures are photographed; later ones add nothing but cost
+        if self._failure_shots < self._screenshots.maxlen:
+            self._failure_shots += 1
+            self.checkpoint(f"Soft assert failed: {message[:40]}")
+
+    def finish(self, failed: bool, test_name: str):
+        if not failed:
+            if self._tracing:
+                # Stopping without a path discards the trace
+                self.page.context.tracing.stop()
+            return
+
+        logger.info(f"Test '{test_name}' failed, attaching trace and screenshots")
+        self.checkpoint("Final state")
+        for name, png in self._screenshots:
+            allure.attach(png, name=name, attachment_type=allure.attachment_type.PNG)
+
+        if self._tracing:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                trace_path = os.path.join(tmp_dir, "trace.zip")
+                self.page.context.tracing.stop(path=trace_path)
+                allure.attach.file(trace_path, name="Playwright Trace (open with 'playwright show-trace')",
+                                   extension="zip")
@@ -0,0 +1,47 @@
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+@contextmanager
+def file_lock(path: str, timeout: float = 300, poll_interval: float = 0.2):
+    """
+    Cross-process exclusive lock on `path` (e.g. shared by pytest-xdist workers).
+    Uses flock where available, otherwise an O_EXCL marker file.
+    """
+    deadline = time.monotonic() + timeout
+
+    if fcntl is not None:
+        with open(path, "a+") as handle:
+            while True:
+                try:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"Timed out waiting for lock {path}")
+                    time.sleep(poll_interval)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        return
+
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for lock {path}")
+            time.sleep(poll_interval)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        os.remove(path)
@@ -0,0 +1,143 @@
+import codecs
+import json
+import re
+from typing import Any, Iterator, Optional
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+class JsonStreamReader:
+    """
+    Incremental reader over a JSON document stored in a (text or binary) file object.
+    Only the part of the document that is currently being decoded is kept in memory,
+    so arrays with millions of elements can be consumed one element at a time.
+    """
+
+    def __init__(self, fp, chunk_size: int = 1 << 16):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+
+    # --- Public API ---
+
+    def iter_array(self) -> Iterator[Any]:
+        """Yields the elements of a top-level JSON array one by one."""
+        self._expect("[")
+        yield from self._iter_array_items()
+
+    def iter_member(self, key: str) -> Iterator[Any]:
+        """
+        Yields the elements of the array stored under `key` in a top-level JSON object.
+        Any other member found on the way is decoded and discarded.
+        """
+        for member_key in self._iter_object_keys():
+            if member_key == key and self._peek() == "[":
+                self._pos += 1
+                yield from self._iter_array_items()
+                return
+            self._skip_value()
+
+    def read_member(self, key: str, default: Any = None) -> Any:
+        """Returns the value stored under `key` in a top-level JSON object."""
+        for member_key in self._iter_object_keys():
+            if member_key == key:
+                return self._decode_value()
+            self._skip_value()
+        return default
+
+    # --- Object / Array Walkers ---
+
+    def _iter_object_keys(self) -> Iterator[str]:
+        """Yields each member key of a top-level object; the caller must consume its value."""
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            member_key = self._decode_value()
+            self._expect(":")
+            yield member_key
+            if not self._next_separator("}"):
+                return
+
+    def _skip_value(self):
+        # Arrays are walked element by element, so skipping a huge one stays flat in memory
+        if self._peek() == "[":
+            self._pos += 1
+            for _ in self._iter_array_items():
+                pass
+        else:
+            self._decode_value()
+
+    def _iter_array_items(self) -> Iterator[Any]:
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._decode_value()
+            if not self._next_separator("]"):
+                return
+
+    # --- Low Level Helpers ---
+
+    def _decode_value(self) -> Any:
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A value ending exactly at the buffer edge may be a truncated number/literal
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _next_separator(self, closing: str) -> bool:
+        """Consumes ',' (returns True) or the closing bracket (returns False)."""
+        char = self._peek()
+        self._pos += 1
+        if char == ",":
+            return True
+        if char == closing:
+            return False
+        raise json.JSONDecodeError(f"Expected ',' or '{closing}'", self._buffer, self._pos - 1)
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            raise json.JSONDecodeError(f"Expected '{char}'", self._buffer, self._pos)
+        self._pos += 1
+
+    def _peek(self) -> Optional[str]:
+        self._skip_whitespace()
+        return self._buffer[self._pos] if self._pos < len(self._buffer) else None
+
+    def _skip_whitespace(self):
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or not self._fill():
+                return
+
+    def _fill(self) -> bool:
+        """Reads the next chunk into the buffer, dropping everything already consumed."""
+        if self._eof:
+            return False
+        chunk = self._fp.read(self._chunk_size)
+        while isinstance(chunk, bytes):
+            raw = chunk
+            chunk = self._utf8.decode(raw, final=not raw)
+            if chunk or not raw:
+                break
+            chunk = self._fp.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
@@ -0,0 +1,128 @@
+import base64
+import json
+import os
+import time
+from typing import Iterable, Optional
+from urllib.parse import urlparse
+import allure
+from infra.utils.logger_setup import get_logger
+
+logger = get_logger("LeanProfile")
+
+# Resource types no BoardPage selector depends on
+DEFAULT_BLOCKED_TYPES = ("image", "font", "media")
+# Hosts (and their sub-domains) the board needs; everything else is cut off
+DEFAULT_ALLOWED_HOSTS = (
+    "trello.com", "trellocdn.com", "atlassian.com", "atlassian.net", "atl-paas.net", "localhost", "127.0.0.1",
+)
+# 1x1 transparent GIF, served instead of blocked images so layouts keep their boxes
+_PIXEL_GIF = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+
+def _env_list(name: str, default: Iterable[str]) -> tuple:
+    value = os.getenv(name)
+    return tuple(item.strip() for item in value.split(",") if item.strip()) if value else tuple(default)
+
+
+class LeanProfile:
+    """
+    Request routing that keeps only what the board page needs:
+    - images are stubbed with a 1x1 GIF, fonts and media are aborted,
+    - requests to hosts outside the allow-list (analytics, avatars CDNs, ...) are aborted.
+    """
+
+    def __init__(self, allowed_hosts: Iterable[str] = DEFAULT_ALLOWED_HOSTS,
+                 blocked_types: Iterable[str] = DEFAULT_BLOCKED_TYPES):
+        self.allowed_hosts = tuple(allowed_hosts)
+        self.blocked_types = set(blocked_types)
+        self.blocked_count = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["LeanProfile"]:
+        """LEAN_PROFILE=true enables it; LEAN_ALLOWED_HOSTS / LEAN_BLOCKED_TYPES override the defaults."""
+        if os.getenv("LEAN_PROFILE", "false").lower() != "true":
+            return None
+        return cls(
+            allowed_hosts=_env_list("LEAN_ALLOWED_HOSTS", DEFAULT_ALLOWED_HOSTS),
+            blocked_types=_env_list("LEAN_BLOCKED_TYPES", DEFAULT_BLOCKED_TYPES),
+        )
+
+    def install(self, context):
+        """Routes every request of the browser context through the profile (install before opening pages)."""
+        context.route("**/*", self._handle)
+
+    def is_allowed_host(self, url: str) -> bool:
+        host = urlparse(url).hostname or ""
+        return any(host == allowed or host.endswith(f".{allowed}") for allowed in self.allowed_hosts)
+
+    def _handle(self, route):
+        request = route.request
+        if request.url.startswith("data:"):
+            return route.continue_()
+
+        if request.resource_type in self.blocked_types:
+            self.blocked_count += 1
+            if request.resource_type == "image":
+                return route.fulfill(status=200, content_type="image/gif", body=_PIXEL_GIF)
+            return route.abort()
+
+        if not self.is_allowed_host(request.url):
+            self.blocked_count += 1
+            return route.abort()
+
+        return route.continue_()
+
+
+class PageLoadMetrics:
+    """
+    Measures time-to-selector, the number of responses and the bytes transferred until then, and
+    attaches them to the report. Bytes are the encoded sizes the browser reports per finished
+    request (request.sizes(): response headers + body as sent over the wire), not Content-Length.
+    Sizes are read once, in mark_ready, so loading the page pays no per-request round trip.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.requests = 0
+        self.bytes_transferred = None
+        self.time_to_board_ms = None
+        self._finished = []
+        self._started = time.monotonic()
+        page.on("response", self._on_response)
+        page.on("requestfinished", self._finished.append)
+
+    def _on_response(self, response):
+        self.requests += 1
+
+    def start(self):
+        self._started = time.monotonic()
+        self._finished.clear()
+
+    def mark_ready(self):
+        self.time_to_board_ms = round((time.monotonic() - self._started) * 1000)
+        self.bytes_transferred = sum(self._transferred(request) for request in self._finished)
+
+    @staticmethod
+    def _transferred(request) -> int:
+        try:
+            sizes = request.sizes()
+        except Exception as e:
+            # e.g. the request's frame was already detached
+            logger.debug(f"No sizes for {request.url}: {e}")
+            return 0
+        return max(sizes["responseHeadersSize"], 0) + max(sizes["responseBodySize"], 0)
+
+    def as_dict(self, profile: Optional[LeanProfile] = None) -> dict:
+        return {
+            "lean_profile": profile is not None,
+            "time_to_board_ms": self.time_to_board_ms,
+            "bytes_transferred": self.bytes_transferred,
+            "responses": self.requests,
+            "blocked_requests": profile.blocked_count if profile else 0,
+        }
+
+    def attach(self, profile: Optional[LeanProfile] = None):
+        metrics = self.as_dict(profile)
+        logger.info(f"Board load metrics: {metrics}")
+        allure.attach(json.dumps(metrics, indent=2), name="Board Load Metrics",
+                      attachment_type=allure.attachment_type.JSON)
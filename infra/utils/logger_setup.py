@@ -1,6 +1,12 @@
+import atexit
+import json
 import logging
 import os
+import queue
 import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 
 log_dir = "logs"
 if not os.path.exists(log_dir):
@@ -8,18 +14,124 @@ if not os.path.exists(log_dir):
 
 log_format = logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s")
 
+# LOG_FORMAT=json switches both outputs to one JSON object per line
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+# LOG_RATE_LIMIT=N keeps at most N records per second per logger (0 = unlimited)
+LOG_RATE_LIMIT = int(os.getenv("LOG_RATE_LIMIT", "0"))
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Structured output: one JSON object per record."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Drops records above `max_per_second` per logger, then reports how many were dropped
+    once the next one-second window opens. Keeps high-volume failure logs from flooding the writer.
+    """
+
+    def __init__(self, max_per_second: int):
+        super().__init__()
+        self.max_per_second = max_per_second
+        self._window_start = 0.0
+        self._emitted = 0
+        self._suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        now = time.monotonic()
+        if now - self._window_start >= 1:
+            if self._suppressed:
+                record.msg = f"[{self._suppressed} similar records suppressed by rate limit] {record.msg}"
+            self._window_start, self._emitted, self._suppressed = now, 0, 0
+
+        if self._emitted >= self.max_per_second:
+            self._suppressed += 1
+            return False
+        self._emitted += 1
+        return True
+
+
+class _EnqueueHandler(QueueHandler):
+    """QueueHandler that defers all formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def emit(self, record: logging.LogRecord):
+        if _listener is None:
+            # Records logged after shutdown_logging() restart the writer instead of being lost
+            _ensure_listener()
+        super().emit(record)
+
+
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_listener = None
+_listener_lock = threading.Lock()
+_log_file_opened = False
+
+
+def _build_formatter() -> logging.Formatter:
+    return JsonLinesFormatter() if LOG_FORMAT == "json" else log_format
+
+
+def _ensure_listener():
+    """Starts the single background writer shared by every logger."""
+    global _listener, _log_file_opened
+    with _listener_lock:
+        if _listener is not None:
+            return
+
+        formatter = _build_formatter()
+
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(formatter)
+
+        file_name = "execution.jsonl" if LOG_FORMAT == "json" else "execution.log"
+        # Truncate once per process; a restarted writer appends
+        file_mode = 'a' if _log_file_opened else 'w'
+        file_handler = logging.FileHandler(os.path.join(log_dir, file_name), mode=file_mode, encoding='utf-8')
+        file_handler.setFormatter(formatter)
+        _log_file_opened = True
+
+        _listener = QueueListener(_log_queue, console_handler, file_handler, respect_handler_level=True)
+        _listener.start()
+
+
+@atexit.register
+def shutdown_logging():
+    """Flushes every queued record and stops the background writer. Safe to call more than once."""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
 def get_logger(name):
     logger = logging.getLogger(name)
-    
+
     if not logger.handlers:
         logger.setLevel(logging.INFO)
+        _ensure_listener()
 
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(log_format)
-        logger.addHandler(console_handler)
-
-        file_handler = logging.FileHandler(os.path.join(log_dir, "execution.log"), mode='w')
-        file_handler.setFormatter(log_format)
-        logger.addHandler(file_handler)
+        # The calling thread only puts the record on the queue; the listener does the I/O
+        queue_handler = _EnqueueHandler(_log_queue)
+        if LOG_RATE_LIMIT > 0:
+            queue_handler.addFilter(RateLimitFilter(LOG_RATE_LIMIT))
+        logger.addHandler(queue_handler)
 
-    return logger
\ No newline at end of file
+    return logger
@@ -1,12 +1,40 @@
-from typing import List
+import re
+from collections import Counter
+from typing import Callable, Dict, List
 import allure
 from infra.utils.logger_setup import get_logger
 
 logger = get_logger("SoftAssert")
 
+# Failure category = the leading "[BUG - ...]" / "[MISSING CARD]" tag, or the leading upper-case words
+CATEGORY_PATTERN = re.compile(r"^\s*(\[[^\]]+\]|[A-Z][A-Z _-]*[A-Z])")
+
 class SoftAssert:
-    def __init__(self):
+    def __init__(self, aggregate: bool = False, sample_size: int = 20):
+        """
+        :param aggregate: Group failures by category instead of reporting each one as it happens.
+                          Only counts and the first `sample_size` messages per category are kept,
+                          and the Allure attachments are written once, in assert_all().
+        :param sample_size: Messages kept (and logged) per category in aggregate mode.
+        """
         self._errors: List[str] = []
+        self.aggregate = aggregate
+        self.sample_size = sample_size
+        self._category_counts: Counter = Counter()
+        self._category_samples: Dict[str, List[str]] = {}
+        self._failure_listeners: List[Callable[[str], None]] = []
+
+    def add_failure_listener(self, listener: Callable[[str], None]):
+        """Registers a callback invoked with the message of every failed check (e.g. to grab a screenshot)."""
+        self._failure_listeners.append(listener)
+
+    @property
+    def error_count(self) -> int:
+        return sum(self._category_counts.values()) if self.aggregate else len(self._errors)
+
+    @property
+    def has_failures(self) -> bool:
+        return self.error_count > 0
 
     def check(self, condition: bool, message: str):
         """
@@ -14,9 +42,18 @@ class SoftAssert:
         1. Adds error to internal list.
         2. Logs it as ERROR.
         3. Attaches it to Allure report immediately.
+        In aggregate mode the failure is only counted and sampled under its category.
         """
         if not condition:
             formatted_error = f"[FAILURE] {message}"
+
+            for listener in self._failure_listeners:
+                listener(message)
+
+            if self.aggregate:
+                self._record(formatted_error, message)
+                return
+
             self._errors.append(formatted_error)
             
             # Write to Log
@@ -30,15 +67,52 @@ class SoftAssert:
                     attachment_type=allure.attachment_type.TEXT
                 )
 
+    def _record(self, formatted_error: str, message: str):
+        category = self.categorize(message)
+        self._category_counts[category] += 1
+
+        samples = self._category_samples.setdefault(category, [])
+        if len(samples) < self.sample_size:
+            samples.append(formatted_error)
+            logger.error(formatted_error)
+        elif self._category_counts[category] == self.sample_size + 1:
+            logger.error(f"{category}: more than {self.sample_size} failures, further ones are only counted.")
+
+    @staticmethod
+    def categorize(message: str) -> str:
+        match = CATEGORY_PATTERN.match(message)
+        return match.group(1) if match else "OTHER"
+
     def assert_all(self):
         """
         Raises an AssertionError if any errors were collected.
         """
-        if self._errors:
-            error_count = len(self._errors)
+        if self.aggregate:
+            self._attach_aggregated_report()
+        elif self._errors:
             report = "\n".join(self._errors)
             
             # Attach full report to Allure before crashing
             allure.attach(report, name="Full Failure Report", attachment_type=allure.attachment_type.TEXT)
-            
-            raise AssertionError(f"Soft Assert failed with {error_count} errors. Check Allure report or logs for details.")
\ No newline at end of file
+
+        if self.has_failures:
+            error_count = self.error_count
+            raise AssertionError(f"Soft Assert failed with {error_count} errors. Check Allure report or logs for details.")
+
+    def _attach_aggregated_report(self):
+        if not self._category_counts:
+            return
+
+        summary = "\n".join(
+            f"{category}: {count} failures" for category, count in self._category_counts.most_common()
+        )
+        allure.attach(summary, name="Failure Summary", attachment_type=allure.attachment_type.TEXT)
+
+        for category, count in self._category_counts.most_common():
+            samples = self._category_samples[category]
+            header = f"{category}: {count} failures (showing {len(samples)})"
+            allure.attach(
+                "\n".join([header, *samples]),
+                name=f"Failures - {category}",
+                attachment_type=allure.attachment_type.TEXT
+            )
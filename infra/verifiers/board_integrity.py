@@ -0,0 +1,65 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+from infra.clients.gmail_client import GmailClient, TITLE_PREFIX_PATTERN
+from infra.modals.card_modal import CardModal
+
+
+@dataclass
+class DuplicateGroup:
+    title: str
+    positions: List[int]
+
+    @property
+    def size(self) -> int:
+        return len(self.positions)
+
+
+@dataclass
+class IntegrityReport:
+    dirty_cards: List[CardModal] = field(default_factory=list)
+    duplicates: List[DuplicateGroup] = field(default_factory=list)
+
+
+class BoardIntegrityChecker:
+    """
+    Single-pass integrity check of the board:
+    - dirty titles, detected with the same prefix rule GmailClient uses to clean subjects,
+    - duplicate titles, grouped once per title with the positions of every copy.
+    """
+
+    def __init__(self, actual_cards: List[CardModal]):
+        self.actual_cards = actual_cards
+
+    def check(self) -> IntegrityReport:
+        report = IntegrityReport()
+        # Key = title, Value = positions on the board (insertion order = first appearance)
+        positions: Dict[str, List[int]] = {}
+
+        for index, card in enumerate(self.actual_cards):
+            if TITLE_PREFIX_PATTERN.match(card.title):
+                report.dirty_cards.append(card)
+            positions.setdefault(card.title, []).append(index)
+
+        report.duplicates = [
+            DuplicateGroup(title, card_positions)
+            for title, card_positions in positions.items() if len(card_positions) > 1
+        ]
+        return report
+
+
+class DirtyTitleIndex:
+    """
+    Index of the board titles that still carry a 'Task'/'Meeting' marker, keyed by the
+    title GmailClient would produce for them. Answers "which dirty card is this expected
+    card?" with one dict lookup instead of a scan over every board title.
+    """
+
+    def __init__(self, actual_titles: Iterable[str]):
+        self._by_clean_title: Dict[str, str] = {}
+        for title in actual_titles:
+            if "Task" in title or "Meeting" in title:
+                self._by_clean_title.setdefault(GmailClient.normalize_title(title), title)
+
+    def find(self, expected_title: str) -> Optional[str]:
+        """Returns the dirty board title that cleans up to `expected_title`, if any."""
+        return self._by_clean_title.get(expected_title)
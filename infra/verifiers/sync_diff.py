@@ -0,0 +1,115 @@
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from infra.modals.card_modal import CardModal
+
+# Labels whose presence on the expected card must be mirrored on the Trello card
+REQUIRED_LABELS = ("Urgent",)
+
+
+def description_lines(description: str) -> List[str]:
+    """The normalized (stripped, non-empty) lines of a card description."""
+    return [line.strip() for line in description.split('\n') if line.strip()]
+
+
+@dataclass
+class CardFingerprint:
+    """Precomputed comparison data of one card."""
+    lines: List[str]
+    line_set: FrozenSet[str]
+    digest: bytes
+
+    @classmethod
+    def of(cls, card: CardModal) -> "CardFingerprint":
+        lines = description_lines(card.description)
+        line_set = frozenset(lines)
+        hasher = hashlib.blake2b(digest_size=16)
+        for line in sorted(line_set):
+            hasher.update(line.encode('utf-8'))
+            hasher.update(b"\n")
+        hasher.update(b"\0")
+        hasher.update(str(card.label_mask).encode('ascii'))
+        return cls(lines=lines, line_set=line_set, digest=hasher.digest())
+
+
+@dataclass
+class ContentMismatch:
+    expected: CardModal
+    actual: CardModal
+    missing_lines: List[str]
+
+
+@dataclass
+class LabelMismatch:
+    expected: CardModal
+    actual: CardModal
+    missing_labels: List[str]
+
+
+@dataclass
+class SyncDiff:
+    """Structured result of comparing the expected cards against the board."""
+    missing: List[CardModal] = field(default_factory=list)
+    extra: List[CardModal] = field(default_factory=list)
+    content_mismatches: List[ContentMismatch] = field(default_factory=list)
+    label_mismatches: List[LabelMismatch] = field(default_factory=list)
+    matched: int = 0
+
+    @property
+    def is_clean(self) -> bool:
+        return not (self.missing or self.extra or self.content_mismatches or self.label_mismatches)
+
+
+class SyncDiffEngine:
+    """
+    Single hash join between expected and actual cards (keyed by title).
+    Cards whose fingerprints (description line set + labels) are equal are accepted without
+    a deep comparison; otherwise expected lines are looked up in the actual card's line set,
+    and only lines not found there fall back to a substring search.
+    """
+
+    def __init__(self, expected_cards: List[CardModal], actual_cards: List[CardModal]):
+        self.expected_cards = expected_cards
+        self.actual_cards = actual_cards
+
+    def compute(self) -> SyncDiff:
+        diff = SyncDiff()
+        actual_by_title: Dict[str, CardModal] = {card.title: card for card in self.actual_cards}
+        matched_titles = set()
+
+        for expected in self.expected_cards:
+            actual = actual_by_title.get(expected.title)
+            if actual is None:
+                diff.missing.append(expected)
+                continue
+
+            matched_titles.add(expected.title)
+            diff.matched += 1
+            content, labels = self._compare(expected, actual)
+            if content:
+                diff.content_mismatches.append(content)
+            if labels:
+                diff.label_mismatches.append(labels)
+
+        diff.extra = [card for card in self.actual_cards if card.title not in matched_titles]
+        return diff
+
+    @staticmethod
+    def _compare(expected: CardModal, actual: CardModal) -> Tuple[Optional[ContentMismatch], Optional[LabelMismatch]]:
+        expected_print = CardFingerprint.of(expected)
+        actual_print = CardFingerprint.of(actual)
+        if expected_print.digest == actual_print.digest:
+            return None, None
+
+        missing_lines = [
+            line for line in expected_print.lines
+            if line not in actual_print.line_set and line not in actual.description
+        ]
+        missing_labels = [
+            label for label in REQUIRED_LABELS
+            if expected.has_label(label) and not actual.has_label(label)
+        ]
+
+        content = ContentMismatch(expected, actual, missing_lines) if missing_lines else None
+        labels = LabelMismatch(expected, actual, missing_labels) if missing_labels else None
+        return content, labels
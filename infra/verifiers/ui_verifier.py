@@ -1,6 +1,7 @@
 import allure
-from typing import Dict, List
+from typing import Callable, Dict, List
 from playwright.sync_api import Locator
+from infra.modals.card_snapshot import CardSnapshot
 from infra.utils.soft_assert import SoftAssert
 from infra.utils.logger_setup import get_logger
 
@@ -37,15 +38,35 @@ class UIVerifier:
             except Exception:
                 status = "Unknown"
             
-            is_visually_urgent = "Urgent" in card_text or "red" in card.inner_html() or "Urgent" in labels
-            
-            self.soft_assert.check(
-                is_visually_urgent,
-                f"[UI] Card '{title}' is missing visual 'Urgent' indicator (Label/Text)."
-            )
-            
-            if is_visually_urgent:
-                logger.info(f"✅ Verified Urgent Card: Title='{title}' | Labels={labels} | Status='{status}'")
+            self._check_urgent(title, card_text, lambda: "red" in card.inner_html(), labels, status)
+
+    @allure.step("Verify visual indication of 'Urgent' cards (batched)")
+    def verify_urgent_cards_snapshots(self, cards: List[CardSnapshot]):
+        """
+        Same rules as verify_urgent_cards_visuals, applied in Python to card snapshots
+        that were captured from the board in a single browser evaluation.
+        """
+        if not cards:
+            logger.warning("No urgent cards provided for verification.")
+            return
+
+        for card in cards:
+            title = card.text.split('\n')[0]
+            status = card.list_name if card.list_name is not None else "Unknown"
+            self._check_urgent(title, card.text, lambda: card.html_has_red, card.label_names, status)
+
+    def _check_urgent(self, title: str, card_text: str, html_has_red: Callable[[], bool],
+                      labels: List[str], status: str):
+        # The markup check is the most expensive one, so it only runs when text and labels don't match
+        is_visually_urgent = "Urgent" in card_text or html_has_red() or "Urgent" in labels
+        
+        self.soft_assert.check(
+            is_visually_urgent,
+            f"[UI] Card '{title}' is missing visual 'Urgent' indicator (Label/Text)."
+        )
+        
+        if is_visually_urgent:
+            logger.info(f"✅ Verified Urgent Card: Title='{title}' | Labels={labels} | Status='{status}'")
 
     @allure.step("Verify Card Modal Details")
     def verify_card_details(self, actual_details: Dict[str, any], expected_data: Dict[str, any]):
@@ -0,0 +1,265 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import pytest
+
+STUB_KEY = "stub-key"
+STUB_TOKEN = "stub-token"
+STUB_BOARD_ID = "stubBoard"
+
+
+def make_card_id(index: int) -> str:
+    """Trello ids are 24 hex chars that sort by creation time."""
+    return f"{index:024x}"
+
+
+class TrelloStub:
+    """
+    Local stand-in for the Trello REST API.
+    Serves boards from memory and can simulate throttling (429 + rate-limit headers).
+    """
+    board_id = STUB_BOARD_ID
+
+    def __init__(self):
+        self.boards = {}
+        self.requests = []
+        self.throttle_every = 0
+        # Rate-limit window reported on throttled answers
+        self.throttle_interval_ms = 5
+        self.latency = 0.0
+        # TCP connections accepted; keep-alive clients reuse one for many requests
+        self.connections = 0
+        # Requests being handled right now, and the most seen at once
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        # When set, every write (POST/PUT) answers with this status
+        self.write_error_status = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/1"
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def add_board(self, board_id: str, card_count: int = 0, list_count: int = 1, **card_fields):
+        lists = [{"id": f"{board_id}-list-{n}", "name": f"List {n}"} for n in range(list_count)]
+        cards = [
+            dict({"id": make_card_id(i), "name": f"Card {i}", "desc": f"Description {i}",
+                  "labels": [], "idList": lists[i % list_count]["id"]}, **card_fields)
+            for i in range(card_count)
+        ]
+        self.boards[board_id] = {"cards": cards, "lists": lists, "labels": [], "actions": [],
+                                 "dateLastActivity": self._now()}
+        return cards
+
+    def update_card(self, board_id: str, card_id: str, **fields):
+        board = self.boards[board_id]
+        card = next(card for card in board["cards"] if card["id"] == card_id)
+        card.update(fields)
+        self._record_action(board, "updateCard", card_id)
+
+    def delete_card(self, board_id: str, card_id: str):
+        board = self.boards[board_id]
+        board["cards"] = [card for card in board["cards"] if card["id"] != card_id]
+        self._record_action(board, "deleteCard", card_id)
+
+    def move_list_to_board(self, board_id: str, card_count: int):
+        """A list arriving from another board with its cards: one list action, no card actions."""
+        board = self.boards[board_id]
+        trello_list = {"id": f"{board_id}-list-{len(board['lists'])}", "name": "Moved"}
+        board["lists"].append(trello_list)
+        first = len(board["cards"])
+        board["cards"] += [{"id": make_card_id(first + i), "name": f"Moved {i}", "desc": "", "labels": [],
+                            "idList": trello_list["id"]} for i in range(card_count)]
+        self._record_action(board, "moveListToBoard", data={"list": {"id": trello_list["id"]}})
+
+    def _record_action(self, board: dict, action_type: str, card_id: str = None, data: dict = None):
+        board["dateLastActivity"] = self._now()
+        # Trello lists actions newest first
+        board["actions"].insert(0, {"type": action_type, "date": board["dateLastActivity"],
+                                    "data": data or {"card": {"id": card_id}}})
+
+    def _now(self) -> str:
+        # Strictly increasing timestamps, so every change moves dateLastActivity forward
+        self._clock = getattr(self, "_clock", 0) + 1
+        moment = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=self._clock)
+        return moment.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+    # --- Routing ---
+
+    def writes(self):
+        return [(method, path) for method, path, _ in self.requests if method in ("POST", "PUT")]
+
+    def handle(self, method: str, path: str, query: dict, body: dict = None):
+        """Returns (status, headers, payload) for a request."""
+        parts = path.strip("/").split("/")[1:]  # drop the '1' API version
+        if method in ("POST", "PUT"):
+            if self.write_error_status:
+                return self.write_error_status, {}, {"message": "simulated failure"}
+            return self._handle_write(method, parts, body or {})
+
+        if parts[:1] == ["boards"] and len(parts) in (2, 3):
+            board = self.boards.get(parts[1])
+            if board is None:
+                return 404, {}, {"message": "board not found"}
+            if len(parts) == 2:
+                return 200, {}, {"id": parts[1], "dateLastActivity": board["dateLastActivity"]}
+            if parts[2] == "actions":
+                since = query.get("since", [""])[0]
+                return 200, {}, [action for action in board["actions"] if action["date"] > since]
+            if parts[2] == "cards":
+                return 200, {}, self._page(board["cards"], query)
+            if parts[2] == "lists":
+                return 200, {}, board["lists"]
+            if parts[2] == "labels":
+                return 200, {}, board["labels"]
+
+        if parts[:1] == ["cards"] and len(parts) == 2:
+            for board_id, board in self.boards.items():
+                for card in board["cards"]:
+                    if card["id"] == parts[1]:
+                        return 200, {}, dict(card, idBoard=board_id, closed=False)
+            return 404, {}, {"message": "card not found"}
+
+        if parts[:1] == ["lists"] and len(parts) == 3 and parts[2] == "cards":
+            cards = [card for board in self.boards.values() for card in board["cards"] if card["idList"] == parts[1]]
+            return 200, {}, cards
+
+        return 404, {}, {"message": f"no route for {method} {path}"}
+
+    def _handle_write(self, method: str, parts: list, body: dict):
+        if method == "POST" and len(parts) == 3 and parts[0] == "boards" and parts[2] == "labels":
+            board = self.boards[parts[1]]
+            label = {"id": f"{parts[1]}-label-{len(board['labels'])}", "name": body["name"],
+                     "color": body.get("color"), "idBoard": parts[1]}
+            board["labels"].append(label)
+            return 200, {}, label
+
+        if method == "POST" and parts == ["cards"]:
+            board = next((board for board in self.boards.values()
+                          if any(trello_list["id"] == body["idList"] for trello_list in board["lists"])), None)
+            if board is None:
+                return 400, {}, {"message": "invalid value for idList"}
+            card_count = sum(len(b["cards"]) for b in self.boards.values())
+            card = {"id": make_card_id(card_count + 1000000), "name": body["name"], "desc": body.get("desc", ""),
+                    "idList": body["idList"], "labels": self._labels(board, body.get("idLabels", []))}
+            board["cards"].append(card)
+            self._record_action(board, "createCard", card["id"])
+            return 200, {}, card
+
+        if method == "PUT" and len(parts) == 2 and parts[0] == "cards":
+            for board in self.boards.values():
+                for card in board["cards"]:
+                    if card["id"] == parts[1]:
+                        if "desc" in body:
+                            card["desc"] = body["desc"]
+                        if "idLabels" in body:
+                            card["labels"] = self._labels(board, body["idLabels"])
+                        self._record_action(board, "updateCard", card["id"])
+                        return 200, {}, card
+            return 404, {}, {"message": "card not found"}
+
+        return 404, {}, {"message": f"no route for {method} /{'/'.join(parts)}"}
+
+    @staticmethod
+    def _labels(board: dict, label_ids: list) -> list:
+        by_id = {label["id"]: label for label in board["labels"]}
+        return [dict(by_id[label_id]) for label_id in label_ids]
+
+    @staticmethod
+    def _page(items, query):
+        limit = int(query.get("limit", ["1000"])[0])
+        before = query.get("before", [None])[0]
+        selected = [item for item in items if before is None or item["id"] < before]
+        selected.sort(key=lambda item: item["id"], reverse=True)
+        return selected[:limit]
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def _dispatch(self, method):
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                stub.requests.append((method, parsed.path, query))
+                with stub._lock:
+                    stub.in_flight += 1
+                    stub.peak_in_flight = max(stub.peak_in_flight, stub.in_flight)
+                try:
+                    self._respond(method, parsed, query, body)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def _respond(self, method, parsed, query, body):
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                if query.get("key") != [STUB_KEY] or query.get("token") != [STUB_TOKEN]:
+                    return self._send(401, {}, {"message": "invalid key"})
+
+                if stub.throttle_every and len(stub.requests) % stub.throttle_every == 0:
+                    headers = {"Retry-After": "0",
+                               "x-rate-limit-api-token-remaining": "0",
+                               "x-rate-limit-api-token-interval-ms": str(stub.throttle_interval_ms)}
+                    return self._send(429, headers, {"message": "API_TOKEN_LIMIT_EXCEEDED"})
+
+                self._send(*stub.handle(method, parsed.path, query, body))
+
+            def _send(self, status, headers, payload):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def do_PUT(self):
+                self._dispatch("PUT")
+
+        return Handler
+
+
+@pytest.fixture
+def trello_stub(monkeypatch):
+    """Starts a local Trello stand-in and points the Trello credentials at it."""
+    stub = TrelloStub()
+    stub.start()
+    monkeypatch.setenv("TRELLO_API_KEY", STUB_KEY)
+    monkeypatch.setenv("TRELLO_API_TOKEN", STUB_TOKEN)
+    monkeypatch.setenv("TRELLO_BOARD_ID", STUB_BOARD_ID)
+    monkeypatch.setenv("TRELLO_BASE_URL", stub.url)
+    yield stub
+    stub.stop()
@@ -0,0 +1,49 @@
+import json
+import time
+import pytest
+import requests
+from infra.utils.auth_state import AuthStateManager
+
+
+def _save_state(path, expires):
+    cookies = [{"name": "token", "value": "abc", "domain": ".trello.com", "path": "/", "expires": expires}]
+    path.write_text(json.dumps({"cookies": cookies, "origins": []}), encoding='utf-8')
+
+
+class TestAuthStateManager:
+
+    def test_valid_state_is_reused_without_login(self, tmp_path):
+        state = tmp_path / "state.json"
+        _save_state(state, time.time() + 3600)
+        logins = []
+
+        path = AuthStateManager(str(state), check_url=None).ensure_valid(refresh=logins.append)
+
+        assert path == str(state)
+        assert logins == []
+        assert (tmp_path / "state.json.meta").exists()
+
+    def test_expired_state_is_refreshed_once(self, tmp_path):
+        state = tmp_path / "state.json"
+        _save_state(state, time.time() - 60)
+        logins = []
+
+        def login(state_path):
+            logins.append(state_path)
+            _save_state(state, time.time() + 3600)
+
+        manager = AuthStateManager(str(state), check_url=None)
+        manager.ensure_valid(refresh=login)
+        manager.ensure_valid(refresh=login)
+
+        assert logins == [str(state)]
+
+    @pytest.mark.parametrize("status, valid", [(200, True), (401, False), (403, False), (429, True), (503, True)])
+    def test_only_auth_errors_reject_the_session(self, tmp_path, monkeypatch, status, valid):
+        state = tmp_path / "state.json"
+        _save_state(state, time.time() + 3600)
+        response = requests.Response()
+        response.status_code = status
+        monkeypatch.setattr(requests, "get", lambda *args, **kwargs: response)
+
+        assert AuthStateManager(str(state), check_url="https://trello.test/me").is_valid() is valid
@@ -0,0 +1,58 @@
+import pickle
+from infra.modals.card_columns import CardColumns
+from infra.modals.card_modal import CardModal, LABELS
+
+
+class TestCardModal:
+
+    def test_attribute_api_is_compatible(self):
+        card = CardModal(title="title", description="body", labels=["New"])
+        card.add_label("Urgent")
+        card.add_label("New")
+        card.description += "\nmore"
+
+        assert card.labels == ["New", "Urgent"]
+        assert "Urgent" in card.labels and card.has_label("Urgent")
+        assert card == CardModal("title", "body\nmore", ["New", "Urgent"])
+        assert CardModal("title", "").labels == []
+        assert not hasattr(card, "__dict__")
+
+    def test_titles_are_interned_and_pickling_keeps_labels(self):
+        title = "".join(["sum", "marize"])
+        card = CardModal(title=title, description="", labels=["Urgent"])
+
+        assert card.title is CardModal("summarize", "").title
+        assert pickle.loads(pickle.dumps(card)) == card
+
+    def test_labels_keep_insertion_order_and_are_shared(self):
+        LABELS.bit("Alpha")
+        card = CardModal("title", "", ["Zulu", "Alpha", "Zulu"])
+
+        assert card.labels == ["Zulu", "Alpha"]
+        assert card != CardModal("title", "", ["Alpha", "Zulu"])
+        assert card.label_names is CardModal("other", "", ["Zulu", "Alpha"]).label_names
+
+    def test_changing_the_labels_list_updates_the_card(self):
+        card = CardModal("title", "", ["New"])
+        card.labels.append("Urgent")
+        labels = card.labels
+        labels += ["Review"]
+        labels.remove("New")
+
+        assert card.labels == ["Urgent", "Review"]
+        assert card.has_label("Review") and not card.has_label("New")
+
+
+class TestCardColumns:
+
+    def test_columns_round_trip_and_filter(self):
+        cards = [CardModal(f"card {i}", f"body {i}", ["New", "Urgent"] if i % 3 == 0 else ["New"]) for i in range(9)]
+        columns = CardColumns.from_cards(cards)
+        assert list(columns) == cards
+        assert columns.rows_with_label("Urgent") == [0, 3, 6]
+        assert columns.label_counts() == {"New": 9, "Urgent": 3}
+        assert columns.index_by_title()["card 4"] == 4
+
+    def test_columns_keep_label_order(self):
+        columns = CardColumns.from_cards([CardModal("card", "", ["Zulu", "Alpha"])])
+        assert columns[0].labels == ["Zulu", "Alpha"]
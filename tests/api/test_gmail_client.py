@@ -0,0 +1,281 @@
+import inspect
+import json
+import os
+import re
+import time
+import pytest
+from infra.clients.expected_state_store import ExpectedStateStore
+from infra.clients import card_merger, gmail_client, parallel_merge
+from infra.clients.card_merger import CardMerger
+from infra.clients.gmail_client import GmailClient
+from infra.clients.label_filter import LabelPredicate
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'mock_gmail_data.json')
+
+
+def _write_mailbox(tmp_path, messages, labels=None):
+    path = tmp_path / "mailbox.json"
+    path.write_text(json.dumps({"labels": labels or [], "messages": messages}, indent=2), encoding='utf-8')
+    return str(path)
+
+
+class TestGmailClient:
+
+    def test_streaming_matches_full_load(self):
+        expected = GmailClient(DATA_PATH).get_expected_cards()
+        streamed = GmailClient(DATA_PATH, streaming=True).get_expected_cards()
+
+        assert streamed == expected
+
+    def test_streaming_reads_labels_header(self):
+        assert GmailClient(DATA_PATH, streaming=True).get_labels() == GmailClient(DATA_PATH).get_labels()
+
+    def test_streaming_yields_cards_before_file_is_consumed(self, tmp_path, monkeypatch):
+        messages = [{"subject": f"Task: item {i}", "body": f"Please do {i}"} for i in range(1000)]
+        messages.append({"subject": "Task: item 0", "body": "Done"})
+        path = _write_mailbox(tmp_path, messages)
+        client = GmailClient(path, streaming=True)
+        opened = []
+        original_open = GmailClient._open_data
+        monkeypatch.setattr(GmailClient, "_open_data", lambda self: opened.append(original_open(self)) or opened[-1])
+
+        cards = client.iter_expected_cards()
+        first = next(cards)
+
+        assert opened[0].buffer.tell() < os.path.getsize(path)
+        assert (first.title, first.description) == ("item 0", "Please do 0")
+        assert [card.description for card in cards][0] == "Please do 1"
+        # The reply at the end of the mailbox is joined once the generator is exhausted
+        assert first.description == "Please do 0\nDone"
+
+    @pytest.mark.parametrize("index_threshold", [card_merger.INDEX_THRESHOLD, 0])
+    def test_merge_engine_matches_substring_semantics(self, tmp_path, monkeypatch, index_threshold):
+        monkeypatch.setattr(card_merger, "INDEX_THRESHOLD", index_threshold)
+        bodies = ["Please do so", "do so", "For all of us", "so\nFor", "URGENT: now", "", "Please do so"]
+        messages = [{"subject": f"Task: thread {i % 3}", "body": bodies[i % len(bodies)]} for i in range(60)]
+        client = GmailClient(_write_mailbox(tmp_path, messages))
+
+        # Reference: the original string-append merge
+        expected = {}
+        for msg in messages:
+            title, body = GmailClient.normalize_title(msg["subject"]), msg["body"]
+            if title not in expected:
+                expected[title] = body
+            elif body and body not in expected[title]:
+                expected[title] = f"{expected[title]}\n{body}" if expected[title] else body
+
+        assert {card.title: card.description for card in client.get_expected_cards()} == expected
+
+    def test_merge_engine_handles_long_reminder_threads(self, tmp_path):
+        messages = [{"subject": "Meeting: daily reminder", "body": "Reminder"} for _ in range(20000)]
+        messages.append({"subject": "Meeting: daily reminder", "body": "This is urgent"})
+        cards = GmailClient(_write_mailbox(tmp_path, messages)).get_expected_cards()
+
+        assert len(cards) == 1
+        assert cards[0].description == "Reminder\nThis is urgent"
+        assert cards[0].labels == ["New", "Urgent"]
+
+    def test_merge_engine_scales_linearly_with_distinct_replies(self):
+        def merge_seconds(count):
+            merger = CardMerger()
+            started = time.perf_counter()
+            for i in range(count):
+                merger.add("thread", f"reply {i}: see item {i * 7919 % 100003}")
+            return time.perf_counter() - started, merger
+
+        small = min(merge_seconds(4000)[0] for _ in range(2))
+        large, merger = min((merge_seconds(16000) for _ in range(2)), key=lambda result: result[0])
+
+        # 4x the replies: ~4x the time when linear, ~16x when every check rescans the description
+        assert large < 9 * small
+        state = merger._states["thread"]
+        assert len(state.index) <= 2 * len(merger.finalize()[0].description)
+
+    @pytest.mark.parametrize("workers", [2, 3])
+    def test_parallel_matches_serial(self, tmp_path, workers):
+        messages = [
+            {"subject": f"Task: thread {i % 37}", "body": "urgent fix" if i % 11 == 0 else f"reply {i % 5}"}
+            for i in range(2000)
+        ]
+        path = _write_mailbox(tmp_path, messages)
+
+        serial = GmailClient(path).get_expected_cards()
+        parallel = GmailClient(path, streaming=True, workers=workers).get_expected_cards()
+
+        assert parallel == serial
+
+    def test_parallel_reports_loaded_messages(self, tmp_path, capsys):
+        path = _write_mailbox(tmp_path, [{"subject": f"Task: {i % 3}", "body": "b"} for i in range(50)])
+
+        GmailClient(path, workers=2).get_expected_cards()
+
+        assert "[DEBUG] Loaded 50 raw messages" in capsys.readouterr().out
+
+    def test_parallel_json_skips_the_parse_pool(self, tmp_path, monkeypatch):
+        path = _write_mailbox(tmp_path, [{"subject": f"Task: {i % 3}", "body": f"b {i}"} for i in range(50)])
+        monkeypatch.setattr(parallel_merge, "ProcessPoolExecutor",
+                            lambda *args, **kwargs: pytest.fail("decoded messages were sent to a parse pool"))
+
+        assert GmailClient(path, workers=2).get_expected_cards() == GmailClient(path).get_expected_cards()
+
+
+class TestIncrementalState:
+
+    @staticmethod
+    def _messages(count, start=0):
+        bodies = ["Please do so", "do so", "URGENT: now", "Please do so today"]
+        return [{"id": f"m{i:05d}", "date": f"Wed, 1 Jan 2025 10:{i // 60 % 60:02d}:{i % 60:02d} +0000",
+                 "subject": f"Task: thread {i % 7}", "body": bodies[i % len(bodies)]}
+                for i in range(start, start + count)]
+
+    def test_new_run_merges_only_new_messages(self, tmp_path, monkeypatch):
+        db = str(tmp_path / "state.db")
+        messages = self._messages(300)
+        GmailClient(_write_mailbox(tmp_path, messages[:200]), state_db=db).get_expected_cards()
+
+        client = GmailClient(_write_mailbox(tmp_path, messages), state_db=db)
+        applied = []
+        original_apply = ExpectedStateStore.apply
+        monkeypatch.setattr(ExpectedStateStore, "apply",
+                            lambda store, rows: applied.extend(rows) or original_apply(store, rows))
+        cards = client.get_expected_cards()
+
+        assert len(applied) == 100
+        assert cards == GmailClient(_write_mailbox(tmp_path, messages), state_db=str(tmp_path / "full.db")).get_expected_cards()
+
+    def test_in_order_mail_is_appended_without_rebuilding(self, tmp_path, monkeypatch):
+        db = str(tmp_path / "state.db")
+        messages = self._messages(140)
+        GmailClient(_write_mailbox(tmp_path, messages[:100]), state_db=db).get_expected_cards()
+        rebuilt = []
+        original_rebuild = ExpectedStateStore._rebuild
+        monkeypatch.setattr(ExpectedStateStore, "_rebuild",
+                            lambda store, title: rebuilt.append(title) or original_rebuild(store, title))
+
+        GmailClient(_write_mailbox(tmp_path, messages[:120]), state_db=db).get_expected_cards()
+        assert rebuilt == []
+
+        late = dict(messages[130], id="late", date=messages[0]["date"])
+        cards = GmailClient(_write_mailbox(tmp_path, messages[:120] + [late]), state_db=db).get_expected_cards()
+        assert rebuilt == [late["subject"].split(": ")[1]]
+        assert cards == GmailClient(_write_mailbox(tmp_path, [late] + messages[:120])).get_expected_cards()
+
+    def test_result_does_not_depend_on_arrival_order(self, tmp_path):
+        messages = self._messages(120)
+        in_order = GmailClient(_write_mailbox(tmp_path, messages), state_db=str(tmp_path / "a.db")).get_expected_cards()
+
+        reversed_db = str(tmp_path / "b.db")
+        GmailClient(_write_mailbox(tmp_path, messages[60:][::-1]), state_db=reversed_db).get_expected_cards()
+        late = GmailClient(_write_mailbox(tmp_path, messages[:60][::-1]), state_db=reversed_db).get_expected_cards()
+
+        assert late == in_order
+
+    def test_matches_full_merge_for_mailbox_in_date_order(self, tmp_path):
+        path = _write_mailbox(tmp_path, self._messages(80))
+
+        assert GmailClient(path, state_db=str(tmp_path / "state.db")).get_expected_cards() == \
+            GmailClient(path).get_expected_cards()
+
+
+class TestExpectedCardsCache:
+
+    def test_cache_hit_skips_parsing(self, tmp_path, monkeypatch):
+        cache_dir = str(tmp_path / "cache")
+        expected = GmailClient(DATA_PATH, cache_dir=cache_dir).get_expected_cards()
+
+        def fail(*args):
+            raise AssertionError("mailbox parsed despite a cache hit")
+        monkeypatch.setattr(GmailClient, "_compute_expected_cards", fail)
+
+        assert GmailClient(DATA_PATH, cache_dir=cache_dir).get_expected_cards() == expected
+
+    def test_data_or_rules_change_invalidates_entry(self, tmp_path, monkeypatch):
+        cache_dir = str(tmp_path / "cache")
+        path = _write_mailbox(tmp_path, [{"subject": "Task: one", "body": "first"}])
+        GmailClient(path, cache_dir=cache_dir).get_expected_cards()
+
+        _write_mailbox(tmp_path, [{"subject": "Task: two", "body": "urgent"}])
+        assert [card.title for card in GmailClient(path, cache_dir=cache_dir).get_expected_cards()] == ["two"]
+
+        monkeypatch.setattr(gmail_client, "RULES_VERSION", gmail_client.RULES_VERSION + 1)
+        GmailClient(path, cache_dir=cache_dir).get_expected_cards()
+        assert len([name for name in os.listdir(cache_dir) if name.endswith(".pickle")]) == 3
+
+    def test_rule_code_change_invalidates_entry_without_version_bump(self, monkeypatch):
+        before = gmail_client.rules_digest()
+
+        monkeypatch.setattr(gmail_client, "TITLE_PREFIX_PATTERN", re.compile(r"(?i)^(Task:|Meeting:|Re:)\s*"))
+        assert gmail_client.rules_digest() != before
+        monkeypatch.undo()
+
+        original_getsource = inspect.getsource
+        monkeypatch.setattr(inspect, "getsource", lambda code: original_getsource(code).replace(
+            "if self._pattern is None", "if not self.rules"))
+        assert gmail_client.rules_digest() != before
+
+    @pytest.mark.parametrize("module, edit", [
+        ("mbox_source", ("HEAD_CHECK_BYTES = 64 * 1024", "HEAD_CHECK_BYTES = 32 * 1024")),
+        ("label_filter", ("class LabelPredicate", "class LabelPredicate2")),
+        ("json_stream", ("class JsonStreamReader", "class JsonStreamReader2")),
+    ])
+    def test_reading_and_selection_code_is_part_of_rules_digest(self, monkeypatch, module, edit):
+        before = gmail_client.rules_digest()
+        original_getsource = inspect.getsource
+        monkeypatch.setattr(inspect, "getsource", lambda code: original_getsource(code).replace(*edit)
+                            if getattr(code, "__name__", "").endswith(module) else original_getsource(code))
+
+        assert gmail_client.rules_digest() != before
+
+
+class TestLabelFilter:
+
+    LABELS = [{"id": label, "name": label} for label in ("INBOX", "TRASH", "SPAM", "Label_1")]
+
+    @staticmethod
+    def _messages():
+        return [
+            {"subject": "Task: keep", "body": "inbox", "labels": ["INBOX", "UNREAD"]},
+            {"subject": "Task: trashed", "body": "urgent", "labels": ["INBOX", "TRASH"]},
+            {"subject": "Task: spam", "body": "spam", "labels": ["SPAM"]},
+            {"subject": "Task: archived", "body": "archive", "labels": []},
+            {"subject": "Task: keep", "body": "project", "labels": ["INBOX", "Label_1"]},
+        ]
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_selects_inbox_without_trash_and_spam(self, tmp_path, streaming):
+        path = _write_mailbox(tmp_path, self._messages(), self.LABELS)
+
+        cards = GmailClient(path, streaming=streaming, label_filter="INBOX,-TRASH,-SPAM").get_expected_cards()
+
+        assert [(card.title, card.description) for card in cards] == [("keep", "inbox\nproject")]
+
+    def test_excluded_messages_are_never_normalized(self, tmp_path, monkeypatch):
+        path = _write_mailbox(tmp_path, self._messages(), self.LABELS)
+        normalized = []
+        original = GmailClient.normalize_title
+        monkeypatch.setattr(GmailClient, "normalize_title",
+                            staticmethod(lambda subject: normalized.append(subject) or original(subject)))
+
+        GmailClient(path, label_filter="-INBOX").get_expected_cards()
+
+        assert sorted(normalized) == ["Task: archived", "Task: spam"]
+
+    def test_predicate_expression_round_trip(self):
+        predicate = LabelPredicate.parse(" INBOX , -TRASH,-SPAM ")
+
+        assert (predicate.required, predicate.excluded) == (("INBOX",), ("TRASH", "SPAM"))
+        assert str(predicate) == "INBOX,-TRASH,-SPAM"
+
+    @pytest.mark.parametrize("expression", ["INBOX,-", "INBOX,,-SPAM", "- "])
+    def test_predicate_rejects_empty_labels(self, expression):
+        with pytest.raises(ValueError):
+            LabelPredicate.parse(expression)
+
+    def test_changing_the_filter_rebuilds_the_state_store(self, tmp_path):
+        path = _write_mailbox(tmp_path, self._messages(), self.LABELS)
+        db = str(tmp_path / "state.db")
+        GmailClient(path, state_db=db, label_filter="INBOX").get_expected_cards()
+
+        cards = GmailClient(path, state_db=db, label_filter="-INBOX").get_expected_cards()
+
+        assert [card.title for card in cards] == ["spam", "archived"]
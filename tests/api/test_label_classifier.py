@@ -0,0 +1,65 @@
+import pickle
+import pytest
+from infra.clients.gmail_client import GmailClient
+from infra.clients.label_classifier import LabelClassifier, LabelRule
+
+
+class TestLabelClassifier:
+
+    def test_default_rule_matches_urgent_in_any_case(self):
+        classifier = LabelClassifier()
+
+        assert classifier.classify("This is URGENT, please") == ["Urgent"]
+        assert classifier.classify("Urgently needed") == ["Urgent"]
+        assert classifier.classify("No rush") == []
+
+    def test_returns_every_label_in_rule_order_and_counts_label_hits(self):
+        classifier = LabelClassifier.parse("Urgent=urgent,asap;Blocker=/block(ed|er)/;Review=review")
+
+        assert classifier.classify("Review ASAP, we are BLOCKED") == ["Urgent", "Blocker", "Review"]
+        assert classifier.classify("asap asap urgent") == ["Urgent"]
+
+        # One hit per labeled message, for the rule that found the label first ("urgent" was not tried)
+        assert classifier.label_hits == {"Urgent=asap": 2, "Blocker=/block(ed|er)/": 1, "Review=review": 1}
+
+    def test_keywords_are_literal(self):
+        classifier = LabelClassifier([LabelRule("Money", "$5 (cash)")])
+
+        assert classifier.classify("pay $5 (CASH) today") == ["Money"]
+        assert classifier.classify("pay 5 cash") == []
+
+    def test_survives_pickling_for_merge_workers(self):
+        classifier = pickle.loads(pickle.dumps(LabelClassifier.parse("Urgent=urgent;Blocker=blocker")))
+
+        assert classifier.classify("blocker, urgent") == ["Urgent", "Blocker"]
+
+    def test_parallel_merge_reports_worker_hits(self, tmp_path):
+        path = tmp_path / "mailbox.json"
+        path.write_text('{"labels": [], "messages": [%s]}' % ",".join(
+            '{"subject": "Task: t%d", "body": "%s"}' % (i % 9, "urgent" if i % 3 == 0 else "later")
+            for i in range(300)), encoding='utf-8')
+        classifier = LabelClassifier()
+
+        cards = GmailClient(str(path), workers=2, classifier=classifier).get_expected_cards()
+
+        assert cards == GmailClient(str(path)).get_expected_cards()
+        assert classifier.label_hits == {"Urgent=urgent": 100}
+
+    def test_overlapping_rules_of_different_labels_are_all_found(self):
+        assert LabelClassifier.parse("Review=review;Code=review code").classify("please review code") == \
+            ["Review", "Code"]
+        assert LabelClassifier.parse("Blocker=blocker;Block=/block/").classify("a blocker") == ["Blocker", "Block"]
+        assert LabelClassifier.parse("Code=code review;Review=review").classify("code review") == ["Code", "Review"]
+
+    def test_lookaround_regex_rules(self):
+        classifier = LabelClassifier.parse(r"Urgent=/urgent(?= now)/;Solo=/(?<!not )solo\b/")
+
+        assert classifier.classify("Urgent now") == ["Urgent"]
+        assert classifier.classify("urgent later, solo run") == ["Solo"]
+        assert classifier.classify("not solo") == []
+
+    def test_upper_case_regex_rule_is_rejected(self):
+        with pytest.raises(ValueError):
+            LabelClassifier.parse("Blocker=/Blocked/")
+
+        assert LabelClassifier.parse(r"Ticket=/\bt-\d+\S*/").classify("See T-42!") == ["Ticket"]
@@ -0,0 +1,48 @@
+from infra.utils.lean_profile import PageLoadMetrics
+
+
+class _FakeRequest:
+
+    def __init__(self, url, headers_size, body_size):
+        self.url = url
+        self._sizes = {"requestBodySize": 0, "requestHeadersSize": 100,
+                       "responseHeadersSize": headers_size, "responseBodySize": body_size}
+
+    def sizes(self):
+        if self._sizes["responseBodySize"] is None:
+            raise RuntimeError("Target closed")
+        return self._sizes
+
+
+class _FakePage:
+
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def emit(self, event, payload):
+        for handler in self.handlers.get(event, []):
+            handler(payload)
+
+
+class TestPageLoadMetrics:
+
+    def test_bytes_transferred_are_the_encoded_sizes_until_ready(self):
+        page = _FakePage()
+        metrics = PageLoadMetrics(page)
+        page.emit("requestfinished", _FakeRequest("https://trello.com/before", 50, 5000))
+
+        metrics.start()
+        for request in (_FakeRequest("https://trello.com/b/1", 300, 12000),
+                        _FakeRequest("https://trello.com/cached", -1, -1),
+                        _FakeRequest("https://trello.com/gone", 200, None)):
+            page.emit("response", request)
+            page.emit("requestfinished", request)
+        metrics.mark_ready()
+        page.emit("requestfinished", _FakeRequest("https://trello.com/after", 300, 9000))
+
+        assert metrics.as_dict()["bytes_transferred"] == 12300
+        assert metrics.as_dict()["responses"] == 3
+        assert metrics.as_dict()["time_to_board_ms"] is not None
@@ -0,0 +1,134 @@
+import base64
+import pytest
+from infra.clients import gmail_client
+from infra.clients.gmail_client import GmailClient
+from infra.clients.mbox_source import MboxSource
+
+PLAIN = """From someone@example.com Sat Jan  4 10:00:00 2025
+Message-ID: <plain-1@example.com>
+Subject: Task: Deploy
+Date: Sat, 4 Jan 2025 10:00:00 +0000
+X-Gmail-Labels: Inbox,Important
+
+Please deploy today
+>From the release notes
+
+"""
+
+MULTIPART = """From someone@example.com Sat Jan  4 11:00:00 2025
+Message-ID: <multi-1@example.com>
+Subject: =?utf-8?q?Meeting:_Deploy?=
+Date: Sat, 4 Jan 2025 11:00:00 +0000
+Content-Type: multipart/mixed; boundary="outer"
+
+--outer
+Content-Type: multipart/alternative; boundary="inner"
+
+--inner
+Content-Type: text/plain; charset=utf-8
+Content-Transfer-Encoding: quoted-printable
+
+This is urgent =E2=9C=85
+--inner
+Content-Type: text/html
+
+<p>This is urgent</p>
+--inner--
+--outer
+Content-Type: text/plain
+Content-Disposition: attachment; filename="notes.txt"
+Content-Transfer-Encoding: base64
+
+{attachment}
+--outer--
+
+""".format(attachment=base64.b64encode(b"attached text " * 100).decode())
+
+
+def _write(path, *messages):
+    path.write_text("".join(messages), encoding='utf-8')
+    return str(path)
+
+
+class TestMboxSource:
+
+    def test_decodes_headers_and_text_plain_only(self, tmp_path):
+        source = MboxSource(_write(tmp_path / "mail.mbox", PLAIN, MULTIPART))
+
+        assert len(source) == 2
+        assert source[0]["body"] == "Please deploy today\nFrom the release notes"
+        assert source[0]["labels"] == ["Inbox", "Important"]
+        assert source[1]["subject"] == "Meeting: Deploy"
+        assert source[1]["body"] == "This is urgent ✅"
+        assert source[1]["id"] == "<multi-1@example.com>"
+
+    def test_index_is_reused_and_extended_after_append(self, tmp_path):
+        path = tmp_path / "mail.mbox"
+        MboxSource(_write(path, PLAIN, MULTIPART))
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(PLAIN.replace("plain-1", "plain-2"))
+
+        source = MboxSource(str(path))
+
+        assert len(source) == 3
+        assert [msg["id"] for msg in source.iter_messages(start=2)] == ["<plain-2@example.com>"]
+
+    def test_raw_rfc822_message_is_one_message(self, tmp_path):
+        raw = PLAIN.split("\n", 1)[1]
+        source = MboxSource(_write(tmp_path / "message.eml", raw))
+
+        assert len(source) == 1 and source[0]["subject"] == "Task: Deploy"
+
+    def test_gmail_client_merges_mbox_messages(self, tmp_path):
+        client = GmailClient.from_mbox(_write(tmp_path / "mail.mbox", PLAIN, MULTIPART))
+
+        cards = client.get_expected_cards()
+
+        assert [(card.title, card.labels) for card in cards] == [("Deploy", ["New", "Urgent"])]
+        assert cards[0].description == "Please deploy today\nFrom the release notes\nThis is urgent ✅"
+
+    def test_label_filter_decodes_only_selected_bodies(self, tmp_path, monkeypatch):
+        client = GmailClient.from_mbox(_write(tmp_path / "mail.mbox", PLAIN, MULTIPART), label_filter="Inbox")
+        decoded = []
+        original = MboxSource._find_text_plain
+        monkeypatch.setattr(MboxSource, "_find_text_plain",
+                            lambda source, headers, *args, **kwargs:
+                            decoded.append(headers['Subject']) or original(source, headers, *args, **kwargs))
+
+        assert [msg["subject"] for msg in client.iter_messages()] == ["Task: Deploy"]
+        assert decoded == ["Task: Deploy"]
+        assert client.source.labels_at(1) == []
+
+    def test_parallel_workers_parse_the_archive_themselves(self, tmp_path):
+        messages = [PLAIN.replace("plain-1", f"plain-{i}").replace("Task: Deploy", f"Task: Deploy {i % 4}")
+                    .replace("Inbox", "Inbox" if i % 3 else "Spam") for i in range(30)]
+        path = _write(tmp_path / "mail.mbox", *messages, MULTIPART)
+
+        serial = GmailClient.from_mbox(path, label_filter="-Spam").get_expected_cards()
+        parallel = GmailClient.from_mbox(path, label_filter="-Spam", workers=2)._get_expected_cards_parallel(chunk_size=7)
+
+        assert parallel == serial and len(serial) == 5
+
+    def test_mboxrd_unquoting_precedes_transfer_decoding(self, tmp_path):
+        quoted = PLAIN.replace("Please deploy today\n>From the release notes",
+                               ">From the first line\n>>From a quoted line\nsoft=\n>From broken")
+        quoted = quoted.replace("X-Gmail-Labels", "Content-Transfer-Encoding: quoted-printable\nX-Gmail-Labels")
+
+        with GmailClient.from_mbox(_write(tmp_path / "mail.mbox", quoted)) as client:
+            body = client.source[0]["body"]
+
+        assert body == "From the first line\n>From a quoted line\nsoftFrom broken"
+        assert client.source._file.closed
+
+    def test_cache_keys_archive_by_fingerprint_not_content_digest(self, tmp_path, monkeypatch):
+        path = tmp_path / "mail.mbox"
+        cache_dir = str(tmp_path / "cache")
+        _write(path, PLAIN, MULTIPART)
+        monkeypatch.setattr(gmail_client, "file_digest", lambda *args: pytest.fail("archive was re-hashed"))
+
+        with GmailClient.from_mbox(str(path), cache_dir=cache_dir) as client:
+            assert [card.title for card in client.get_expected_cards()] == ["Deploy"]
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(PLAIN.replace("plain-1", "plain-2").replace("Task: Deploy", "Task: Review"))
+        with GmailClient.from_mbox(str(path), cache_dir=cache_dir) as client:
+            assert [card.title for card in client.get_expected_cards()] == ["Deploy", "Review"]
@@ -0,0 +1,34 @@
+from infra.pages.response_index import TrelloResponseIndex
+
+BOARD_PAYLOAD = {
+    "id": "board1", "name": "droxi",
+    "lists": [{"id": "list1", "name": "To Do", "idBoard": "board1", "pos": 1, "closed": False}],
+    "labels": [{"id": "label1", "name": "Urgent", "color": "red", "idBoard": "board1"}],
+    "cards": [
+        {"id": "card1", "name": "Deploy", "desc": "Ship it", "idList": "list1", "idLabels": ["label1"], "labels": []},
+        {"id": "card2", "name": "Review", "desc": "", "idList": "list1", "idLabels": [],
+         "labels": [{"id": "label2", "name": "Docs", "color": "blue", "idBoard": "board1"}]},
+    ],
+}
+
+
+class TestTrelloResponseIndex:
+
+    def test_card_details_from_board_payload(self):
+        index = TrelloResponseIndex()
+        index.ingest(BOARD_PAYLOAD)
+
+        assert len(index) == 2
+        assert index.card_details("Deploy") == {
+            "title": "Deploy", "description": "Ship it", "labels": ["Urgent"], "status": "To Do"
+        }
+        assert index.card_details("Review")["labels"] == ["Docs"]
+        assert index.card_details("Unknown") is None
+
+    def test_later_card_payload_updates_indexed_card(self):
+        index = TrelloResponseIndex()
+        index.ingest(BOARD_PAYLOAD)
+        index.ingest({"id": "card1", "name": "Deploy", "desc": "Ship it today", "idList": "list1"})
+
+        assert index.card_details("Deploy")["description"] == "Ship it today"
+        assert index.card_details("Deploy")["labels"] == ["Urgent"]
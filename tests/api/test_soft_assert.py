@@ -0,0 +1,27 @@
+import pytest
+from infra.utils.soft_assert import SoftAssert
+
+
+class TestSoftAssert:
+
+    def test_aggregate_mode_counts_and_samples_by_category(self):
+        asserter = SoftAssert(aggregate=True, sample_size=3)
+        for i in range(1000):
+            asserter.check(False, f"[MISSING CARD] 'card {i}' exists in Gmail but NOT in Trello.")
+        asserter.check(False, "LABEL MISMATCH: 'x' expected 'Urgent' label.")
+        asserter.check(True, "[MISSING CARD] passing checks are ignored")
+
+        assert asserter.error_count == 1001
+        assert asserter._category_counts == {"[MISSING CARD]": 1000, "LABEL MISMATCH": 1}
+        assert len(asserter._category_samples["[MISSING CARD]"]) == 3
+
+    @pytest.mark.parametrize("aggregate", [False, True])
+    def test_pass_fail_semantics(self, aggregate):
+        passing = SoftAssert(aggregate=aggregate)
+        passing.check(True, "fine")
+        passing.assert_all()
+
+        failing = SoftAssert(aggregate=aggregate)
+        failing.check(False, "[UI] broken")
+        with pytest.raises(AssertionError, match="failed with 1 errors"):
+            failing.assert_all()
@@ -0,0 +1,72 @@
+import pytest
+from infra.modals.card_modal import CardModal
+from infra.utils.soft_assert import SoftAssert
+from infra.verifiers.sync_verifier import SyncVerifier
+
+
+def _card(title, description="", labels=None):
+    return CardModal(title=title, description=description, labels=labels or ["New"])
+
+
+class TestSyncVerifier:
+
+    def test_diff_reports_each_category(self):
+        expected = [
+            _card("in sync", "line one\nline two", ["New", "Urgent"]),
+            _card("wrong content", "kept\nlost"),
+            _card("not urgent", "body", ["New", "Urgent"]),
+            _card("missing", "body"),
+        ]
+        actual = [
+            _card("in sync", "line two\nline one", ["Urgent", "New"]),
+            _card("wrong content", "kept and more"),
+            _card("not urgent", "body"),
+            _card("extra", "body"),
+        ]
+        verifier = SyncVerifier(expected, actual, SoftAssert())
+
+        diff = verifier.compute_diff()
+
+        assert [card.title for card in diff.missing] == ["missing"]
+        assert [card.title for card in diff.extra] == ["extra"]
+        assert [(m.expected.title, m.missing_lines) for m in diff.content_mismatches] == [("wrong content", ["lost"])]
+        assert [(m.expected.title, m.missing_labels) for m in diff.label_mismatches] == [("not urgent", ["Urgent"])]
+        assert diff.matched == 3
+
+    def test_soft_assert_messages_are_unchanged(self):
+        expected = [_card("merged", "For all of us\nPlease do so", ["New", "Urgent"]), _card("gone", "x")]
+        actual = [_card("merged", "For all of us Please do so")]
+        soft_assert = SoftAssert()
+
+        SyncVerifier(expected, actual, soft_assert).verify_cards_existence_and_content()
+
+        # Lines found as a substring of a joined description still pass
+        assert soft_assert._errors == [
+            "[FAILURE] [MISSING CARD] 'gone' exists in Gmail but NOT in Trello.",
+            "[FAILURE] LABEL MISMATCH: 'merged' expected 'Urgent' label.",
+        ]
+        with pytest.raises(AssertionError):
+            soft_assert.assert_all()
+
+    def test_integrity_reports_each_duplicate_group_once(self):
+        actual = [_card("Task: dirty"), _card("twice"), _card("once"), _card("twice"), _card("meeting: Dirty")]
+        soft_assert = SoftAssert()
+
+        report = SyncVerifier([], actual, soft_assert).verify_board_integrity()
+
+        assert [card.title for card in report.dirty_cards] == ["Task: dirty", "meeting: Dirty"]
+        assert [(group.title, group.size, group.positions) for group in report.duplicates] == [("twice", 2, [1, 3])]
+        assert soft_assert._errors[-1] == "[FAILURE] [BUG - DUPLICATION] Card 'twice' appears 2 times! (positions: [1, 3])"
+        assert len(soft_assert._errors) == 3
+
+    def test_missing_card_is_matched_to_its_dirty_title(self):
+        expected = [_card("summarize the meeting"), _card("really missing")]
+        actual = [_card("Task:  summarize the meeting"), _card("Meeting: other")]
+        soft_assert = SoftAssert()
+
+        SyncVerifier(expected, actual, soft_assert).verify_cards_existence_and_content()
+
+        assert soft_assert._errors == [
+            "[FAILURE] [BUG - TITLE NOT CLEANED] Found 'Task:  summarize the meeting', expected clean 'summarize the meeting'.",
+            "[FAILURE] [MISSING CARD] 'really missing' exists in Gmail but NOT in Trello.",
+        ]
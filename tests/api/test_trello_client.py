@@ -0,0 +1,207 @@
+import os
+import threading
+import time
+import pytest
+import requests
+from infra.clients.async_trello_client import AsyncTrelloClient
+from infra.clients.sync_executor import TrelloSyncExecutor
+from infra.clients.trello_client import TrelloClient
+from infra.clients.trello_transport import TrelloTransport
+from infra.modals.card_modal import CardModal
+
+
+class TestTrelloClient:
+
+    def test_pages_through_large_board(self, trello_stub):
+        trello_stub.add_board(trello_stub.board_id, card_count=100_000)
+
+        cards = TrelloClient().get_all_cards()
+
+        assert len(cards) == 100_000
+        assert len({card.title for card in cards}) == 100_000
+        assert len(trello_stub.requests) == 101  # 100 full pages + the empty one closing the board
+
+    def test_backs_off_on_throttling(self, trello_stub):
+        trello_stub.add_board(trello_stub.board_id, card_count=5000)
+        trello_stub.throttle_every = 2
+
+        cards = TrelloClient().get_all_cards()
+
+        assert len(cards) == 5000
+        assert len(trello_stub.requests) > 6  # 6 pages plus the throttled attempts
+
+    def test_reuses_one_pooled_session(self, trello_stub):
+        trello_stub.add_board(trello_stub.board_id, card_count=10)
+        client = TrelloClient(page_size=3)
+
+        assert len(client.get_all_cards()) == 10
+        assert len(client.get_all_cards()) == 10
+        assert len(trello_stub.requests) == 8  # 4 pages per call
+        assert trello_stub.connections == 1
+
+    def test_gives_up_after_max_retries(self, trello_stub):
+        trello_stub.add_board(trello_stub.board_id, card_count=1)
+        trello_stub.throttle_every = 1
+        transport = TrelloTransport(trello_stub.url, "stub-key", "stub-token", max_retries=2)
+
+        with pytest.raises(requests.HTTPError):
+            transport.get_json(f"/boards/{trello_stub.board_id}/cards")
+        assert len(trello_stub.requests) == 3
+
+
+class TestAsyncTrelloClient:
+
+    def test_matches_sync_client_output(self, trello_stub):
+        trello_stub.add_board(trello_stub.board_id, card_count=50, list_count=4)
+
+        sync_cards = TrelloClient().get_all_cards()
+        async_cards = AsyncTrelloClient().get_all_cards()
+
+        assert sorted(async_cards, key=lambda c: c.title) == sorted(sync_cards, key=lambda c: c.title)
+
+    def test_fetches_boards_concurrently(self, trello_stub):
+        board_ids = [f"board{n}" for n in range(6)]
+        for board_id in board_ids:
+            trello_stub.add_board(board_id, card_count=30, list_count=3)
+        trello_stub.latency = 0.1
+        client = AsyncTrelloClient(max_concurrency=4)
+
+        results = client.get_cards_for_boards(board_ids)
+        client.close()
+
+        assert {board_id: len(cards) for board_id, cards in results.items()} == dict.fromkeys(board_ids, 30)
+        # 6 boards x 4 requests, never more than the concurrency limit at once
+        assert trello_stub.peak_in_flight == 4
+
+    def test_thread_transports_share_one_rate_limit_gate(self, trello_stub):
+        trello_stub.add_board(trello_stub.board_id, card_count=1)
+        trello_stub.throttle_every, trello_stub.throttle_interval_ms = 1, 300
+        client = AsyncTrelloClient(max_concurrency=2)
+        made = []
+        threads = [threading.Thread(target=lambda: made.append(client._transports.get())) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+            thread.join()
+        first, second = made
+        first.max_retries = 0
+
+        with pytest.raises(requests.HTTPError):
+            first.get_json(f"/boards/{trello_stub.board_id}/cards")
+        trello_stub.throttle_every = 0
+        started = time.monotonic()
+        second.get_json(f"/boards/{trello_stub.board_id}/cards")
+        client.close()
+
+        assert first is not second and first.gate is second.gate is client.rate_limit
+        # The window exhausted on the first thread's session also paused the second one
+        assert time.monotonic() - started >= 0.25
+
+
+class TestBoardSnapshotCache:
+
+    def test_unchanged_board_costs_one_request(self, trello_stub, tmp_path):
+        trello_stub.add_board(trello_stub.board_id, card_count=5000)
+        TrelloClient(snapshot_dir=str(tmp_path)).get_all_cards()
+        trello_stub.requests.clear()
+
+        cards = TrelloClient(snapshot_dir=str(tmp_path)).get_all_cards()
+
+        assert len(cards) == 5000
+        assert [path for _, path, _ in trello_stub.requests] == [f"/1/boards/{trello_stub.board_id}"]
+
+    def test_applies_only_changed_cards(self, trello_stub, tmp_path):
+        cards = trello_stub.add_board(trello_stub.board_id, card_count=5000)
+        TrelloClient(snapshot_dir=str(tmp_path)).get_all_cards()
+        trello_stub.update_card(trello_stub.board_id, cards[10]["id"], name="Renamed")
+        trello_stub.delete_card(trello_stub.board_id, cards[20]["id"])
+        trello_stub.requests.clear()
+
+        titles = {card.title for card in TrelloClient(snapshot_dir=str(tmp_path)).get_all_cards()}
+
+        assert len(titles) == 4999
+        assert "Renamed" in titles and "Card 10" not in titles and "Card 20" not in titles
+        assert len(trello_stub.requests) == 3  # board activity, actions, one changed card
+
+    def test_list_moved_onto_board_rebuilds_snapshot(self, trello_stub, tmp_path):
+        trello_stub.add_board(trello_stub.board_id, card_count=10)
+        TrelloClient(snapshot_dir=str(tmp_path)).get_all_cards()
+        trello_stub.move_list_to_board(trello_stub.board_id, card_count=5)
+
+        titles = {card.title for card in TrelloClient(snapshot_dir=str(tmp_path)).get_all_cards()}
+
+        assert len(titles) == 15 and "Moved 4" in titles
+
+    def test_evicts_least_recently_used_board(self, trello_stub, tmp_path):
+        for board_id in ("boardA", "boardB"):
+            trello_stub.add_board(board_id, card_count=200)
+        client = TrelloClient(snapshot_dir=str(tmp_path))
+        client.snapshot_cache.max_bytes = 1
+
+        client.snapshot_cache.get_cards("boardA")
+        client.snapshot_cache.get_cards("boardB")
+
+        assert sorted(os.listdir(tmp_path)) == ["boardB.json"]
+
+
+class TestSyncExecutor:
+
+    @staticmethod
+    def expected_cards():
+        return [CardModal(f"Card {i}", f"Description {i}", ["New"]) for i in range(3)] + [
+            CardModal("Fresh task", "Call the client", ["New", "Urgent"]),
+        ]
+
+    def test_creates_and_updates_then_second_run_writes_nothing(self, trello_stub):
+        trello_stub.add_board(trello_stub.board_id, card_count=3)
+        executor = TrelloSyncExecutor(TrelloClient(), workers=3)
+
+        first = executor.sync(self.expected_cards())
+        trello_stub.requests.clear()
+        second = executor.sync(self.expected_cards())
+
+        assert (first.created, first.updated, first.unchanged) == (1, 3, 0) and first.is_clean
+        assert (second.created, second.updated, second.unchanged) == (0, 0, 4)
+        assert trello_stub.writes() == []
+        actual = {card.title: card for card in TrelloClient().get_all_cards()}
+        assert actual["Fresh task"] == CardModal("Fresh task", "Call the client", ["New", "Urgent"])
+
+    def test_resolves_labels_once_and_keeps_foreign_labels(self, trello_stub):
+        cards = trello_stub.add_board(trello_stub.board_id, card_count=3)
+        trello_stub.boards[trello_stub.board_id]["labels"].append(
+            {"id": "docs", "name": "Docs", "color": "blue", "idBoard": trello_stub.board_id})
+        trello_stub.update_card(trello_stub.board_id, cards[0]["id"], labels=[{"id": "docs", "name": "Docs"}])
+        trello_stub.requests.clear()
+
+        TrelloSyncExecutor(TrelloClient()).sync(self.expected_cards())
+
+        label_posts = [path for method, path in trello_stub.writes() if path.endswith("/labels")]
+        label_reads = [path for method, path, _ in trello_stub.requests if method == "GET" and path.endswith("/labels")]
+        assert len(label_posts) == 2 and len(label_reads) == 1  # "New" and "Urgent" created once
+        card_0 = next(card for card in TrelloClient().get_all_cards() if card.title == "Card 0")
+        assert card_0.has_label("Docs") and card_0.has_label("New")
+
+    def test_only_idempotent_writes_are_retried_on_server_error(self, trello_stub):
+        trello_stub.write_error_status = 503
+        transport = TrelloTransport(trello_stub.url, "stub-key", "stub-token", max_retries=2, backoff_seconds=0)
+
+        with pytest.raises(requests.HTTPError):
+            transport.send_json("POST", "/cards", {"idList": "list", "name": "x"})
+        with pytest.raises(requests.HTTPError):
+            transport.send_json("PUT", "/cards/some-card", {"desc": "x"})
+
+        assert [method for method, _ in trello_stub.writes()] == ["POST", "PUT", "PUT", "PUT"]
+
+    def test_writes_use_per_thread_transports_sharing_the_gate(self, trello_stub, monkeypatch):
+        trello_stub.add_board(trello_stub.board_id, card_count=3)
+        trello_stub.latency = 0.05
+        client = TrelloClient()
+        made = []
+        original_sibling = TrelloTransport.sibling
+        monkeypatch.setattr(TrelloTransport, "sibling",
+                            lambda transport, *args: made.append(original_sibling(transport, *args)) or made[-1])
+
+        result = TrelloSyncExecutor(client, workers=3).sync(self.expected_cards())
+
+        assert (result.created, result.updated) == (1, 3) and result.is_clean
+        assert len({id(transport.session) for transport in made}) == len(made) > 1
+        assert all(transport.gate is client.transport.gate for transport in made)